@@ -4,6 +4,7 @@ Copyright (c) Peter Triesberger
 For further information see https://github.com/peter88213/nv_writer
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+from xml.sax.saxutils import escape
 
 
 class Comment:
@@ -20,11 +21,12 @@ class Comment:
             self.text = f'{self.text}{separator}{text}'
 
     def get_xml(self):
+        # The text comes XML-escaped from the text parser.
         text = self.text.replace('\n', '</p><p>')
         return(
             '<comment>'
-            f'<creator>{self.creator}</creator>'
-            f'<date>{self.date}</date>'
+            f'<creator>{escape(self.creator)}</creator>'
+            f'<date>{escape(self.date)}</date>'
             f'<p>{text}</p>'
             '</comment>'
         )
@@ -21,10 +21,88 @@ from nvwriter.nvwriter_globals import prefs
 from nvwriter.text_parser import TextParser
 import tkinter as tk
 
+CHANGE_TRACKER = '''
+namespace eval ::nvwriter {}
+
+proc ::nvwriter::track {w args} {
+    # Record the lines affected by a text widget command, then execute it.
+    # ::nvwriter::clean($w,$channel) holds the number of leading and
+    # trailing lines that have not been touched since the channel's reset.
+    set inner ${w}_inner
+    switch -exact -- [lindex $args 0] {
+        insert {
+            set index [lindex $args 1]
+            ::nvwriter::touch $w [list $index $index]
+        }
+        delete {
+            ::nvwriter::touch $w [lrange $args 1 end]
+        }
+        replace {
+            ::nvwriter::touch $w [lrange $args 1 2]
+        }
+        tag {
+            set option [lindex $args 1]
+            if {$option in {add remove} && [lindex $args 2] ne "sel"} {
+                ::nvwriter::touch $w [lrange $args 3 end]
+            } elseif {$option eq "delete"} {
+                ::nvwriter::touch_all $w
+            }
+        }
+        edit {
+            if {[lindex $args 1] in {undo redo}} {
+                ::nvwriter::touch_all $w
+            }
+        }
+    }
+    tailcall $inner {*}$args
+}
+
+proc ::nvwriter::touch {w indices} {
+    set inner ${w}_inner
+    if {[llength $indices] % 2} {
+        # A single character is affected.
+        # Its tag toggles may extend to the start of the next line.
+        lappend indices "[lindex $indices end] +1c"
+    }
+    if {[catch {
+        set lines {}
+        foreach index $indices {
+            lappend lines [lindex [split [$inner index $index] .] 0]
+        }
+        set first [tcl::mathfunc::min {*}$lines]
+        set last [tcl::mathfunc::max {*}$lines]
+        set total [lindex [split [$inner index end-1c] .] 0]
+        set first [expr {min($first, $total)}]
+    }]} {
+        ::nvwriter::touch_all $w
+        return
+    }
+    foreach key [array names ::nvwriter::clean $w,*] {
+        lassign $::nvwriter::clean($key) top bottom
+        set top [expr {min($top, $first - 1)}]
+        set bottom [expr {max(0, min($bottom, $total - $last))}]
+        set ::nvwriter::clean($key) [list $top $bottom]
+    }
+}
+
+proc ::nvwriter::touch_all {w} {
+    foreach key [array names ::nvwriter::clean $w,*] {
+        set ::nvwriter::clean($key) {0 0}
+    }
+}
+'''
+# Tcl code for tracking the lines changed since the last serialization
+# or word count
+XML_CHANNEL = 'xml'
+WC_CHANNEL = 'wc'
+
 
 class EditorBox(tk.Text):
     """A text editor widget for novelibre raw markup."""
 
+    INSERT_CHUNK_SIZE = 500
+    # maximum number of (text, tags) segments per Tcl insert call
+
     def __init__(
         self,
         master=None,
@@ -90,6 +168,25 @@ class EditorBox(tk.Text):
 
         self.debug = False
 
+        self.bulkDump = True
+        # if True, get the text widget's content with one Tcl call
+        # if False, have Tcl call back the parser for each dumped item
+
+        # Track the paragraphs changed since the last serialization.
+        self._paragraphCache = []
+        # list of (parser state, XML string, parser state) tuples per line
+        self.tk.eval(CHANGE_TRACKER)
+        self.tk.call('rename', self._w, f'{self._w}_inner')
+        self.tk.call(
+            'interp', 'alias', '', self._w, '', '::nvwriter::track', self._w
+        )
+        self._reset_change_tracker(XML_CHANNEL, 0)
+
+        # Provide the lines changed since the last word count.
+        self._countedLines = 0
+        # number of lines at the last get_changed_lines() call
+        self._reset_change_tracker(WC_CHANNEL, 0)
+
     def capitalize(self):
         self._replace_selected(
             self._lower,
@@ -98,6 +195,8 @@ class EditorBox(tk.Text):
 
     def clear(self):
         self.delete('1.0', 'end')
+        self._paragraphCache.clear()
+        self._countedLines = 0
 
     def comment(self):
         """Make the selection a comment.
@@ -109,19 +208,12 @@ class EditorBox(tk.Text):
 
         # If a comment is within the selection, uncomment it.
         uncommented = False
-        index = 'sel.first'
-        while self.compare(index, '<=', 'sel.last'):
-            if T_COMMENT in self.tag_names(index):
-                self.tag_remove(T_COMMENT, index)
-                for i in range(len(self._novxParser.comments)):
-                    commentTag = f'{COMMENT_PREFIX}:{i}'
-                    if commentTag in self.tag_names(index):
-                        self.tag_remove(commentTag, index)
-                        uncommented = True
-
-            index = self.index(f'{index}+1c')
-            if self.compare(index, '>=', 'end-1c'):
-                break
+        if self._overlaps_tag(T_COMMENT, 'sel.first', 'sel.last'):
+            commentTags = self._get_comments_within('sel.first', 'sel.last')
+            self.tag_remove(T_COMMENT, 'sel.first', 'sel.last')
+            for commentTag in commentTags:
+                self.tag_remove(commentTag, 'sel.first', 'sel.last')
+                uncommented = True
 
         if uncommented:
             return False
@@ -165,6 +257,15 @@ class EditorBox(tk.Text):
             foreground=prefs['color_strong'],
         )
 
+    def destroy(self):
+        """Remove the change tracker.
+        
+        Extends the superclass method.
+        """
+        super().destroy()
+        self.tk.call('interp', 'alias', '', self._w, '')
+        self.tk.call('array', 'unset', '::nvwriter::clean', f'{self._w},*')
+
     def emphasis(self):
         """Make the selection emphasized.
         
@@ -172,12 +273,54 @@ class EditorBox(tk.Text):
         """
         return self._set_format(T_EM)
 
-    def get_text(self, start='1.0', end='end'):
-        """Return the whole text from the editor box in .novx format."""
-        self._textParser.reset(debug=self.debug)
+    def get_changed_lines(self):
+        """Return the lines changed since the last call.
+        
+        Return a tuple (top, bottom, lines):
+            top: int -- number of unchanged leading lines.
+            bottom: int -- number of unchanged trailing lines.
+            lines: list of str -- the lines in between.
+        After set_text() or clear(), all lines are returned.
+        """
+        lineCount = int(self.index('end-1c').split('.')[0])
+        top, bottom = self._get_unchanged_lines(WC_CHANNEL)
+        bottom = min(bottom, self._countedLines, lineCount)
+        top = min(top, self._countedLines - bottom, lineCount - bottom)
+        if top + bottom < lineCount:
+            lines = self.get(
+                f'{top + 1}.0',
+                f'{lineCount - bottom + 1}.0'
+            ).split('\n')[:-1]
+        else:
+            lines = []
+        self._countedLines = lineCount
+        self._reset_change_tracker(WC_CHANNEL, lineCount)
+        return top, bottom, lines
+
+    def get_text(self, start='1.0', end='end', validate=False, strict=False):
+        """Return the whole text from the editor box in .novx format.
+        
+        Optional arguments:
+            start: str -- Text index of the first character.
+            end: str -- Text index after the last character.
+            validate: bool -- if True, raise RuntimeError if the elements
+                              of the result are not properly nested,
+                              or contain text that is not enclosed 
+                              with paragraph tags.
+            strict: bool -- if True, the validation also makes sure
+                            that the result is well-formed XML.
+        """
+        self._textParser.reset(
+            debug=self.debug,
+            validate=validate,
+            strict=strict,
+        )
         self._textParser.comments = self._novxParser.comments
         self._textParser.notes = self._novxParser.notes
-        self.dump(start, end, command=self._textParser.parse_triple)
+        if start == '1.0' and end == 'end':
+            self._serialize_paragraphs()
+        else:
+            self._dump_to_parser(start, end)
         return self._textParser.get_result()
 
     def plain(self):
@@ -187,20 +330,34 @@ class EditorBox(tk.Text):
         """
         isModified = False
         if self.tag_ranges('sel'):
-            index = 'sel.first'
-            while not isModified and self.compare(index, '<=', 'sel.last'):
-                tags = self.tag_names(index)
-                for tag in tags:
-                    if tag in EMPHASIZING_TAGS:
-                        isModified = True
-                        break
-                index = self.index(f'{index}+1c')
-                if self.compare(index, '>=', 'end-1c'):
+            for tag in EMPHASIZING_TAGS:
+                if self._overlaps_tag(tag, 'sel.first', 'sel.last'):
+                    isModified = True
                     break
+
             for tag in EMPHASIZING_TAGS:
                 self.tag_remove(tag, 'sel.first', 'sel.last')
         return isModified
 
+    def set_author_name(self, authorName):
+        """Set the creator name for new comments."""
+        self._authorName = authorName or ''
+
+    def set_parsed_text(self, taggedText, comments, notes):
+        """Put already parsed text into the editor box.
+        
+        Positional arguments:
+            taggedText: list -- (text, tags) tuples 
+                                as returned by NovxParser.get_result().
+            comments: list -- Comment instances referenced by the tags.
+            notes: list -- Note instances referenced by the tags.
+
+        Clear the undo/redo stack.
+        """
+        self._novxParser.comments[:] = comments
+        self._novxParser.notes[:] = notes
+        self._insert_tagged_text(taggedText)
+
     def set_text(self, text):
         """Put text into the editor box and clear the undo/redo stack."""
         if text:
@@ -208,21 +365,7 @@ class EditorBox(tk.Text):
             taggedText = self._novxParser.get_result(debug=self.debug)
         else:
             taggedText = []
-
-        # Send the (text, tag) tuples to the text box.
-        for entry in taggedText:
-            if len(entry) == 2:
-                # entry is a regular (text, tag) tuple.
-                text, tag = entry
-                self.insert('end', text, tag)
-            else:
-                # entry is a mark to insert.
-                index = f"{self.count('1.0', 'end', 'lines')[0]}.0"
-                self._textMarks[entry] = index
-
-        self.edit_reset()
-        # this is to prevent the user from clearing the box with Ctrl-Z
-        self.mark_set('insert', f'1.0')
+        self._insert_tagged_text(taggedText)
 
     def strong_emphasis(self):
         """Make the selection strongly emphasized.
@@ -240,43 +383,224 @@ class EditorBox(tk.Text):
     def toggle_case(self):
         self._replace_selected(self._toggle_case)
 
+    def _dump_to_parser(self, start, end):
+        # Feed the text parser with the text and tags between start and end.
+        if self.bulkDump:
+            self._textParser.parse_dump(
+                self.tk.splitlist(
+                    self.tk.call(self._w, 'dump', '-text', '-tag', start, end)
+                )
+            )
+        else:
+            self.dump(start, end, command=self._textParser.parse_triple)
+
+    def _get_comments_within(self, start, end):
+        # Return a list with the tags of the comments
+        # that have characters between start and end.
+        # Visit only the comment runs within the range.
+        commentTags = []
+        pos = self.index(start)
+        end = self.index(end)
+        while self.compare(pos, '<', end):
+            if not T_COMMENT in self.tag_names(pos):
+                commentRun = self.tag_nextrange(T_COMMENT, pos, end)
+                if not commentRun:
+                    break
+
+                pos = commentRun[0]
+            commentTag = T_COMMENT
+            for tag in self.tag_names(pos):
+                if tag.startswith(f'{COMMENT_PREFIX}:'):
+                    commentTag = tag
+                    commentTags.append(commentTag)
+                    break
+
+            # Go to the end of the comment,
+            # where another comment may start.
+            __, pos = self.tag_prevrange(commentTag, f'{pos}+1c')
+        return commentTags
+
+    def _insert_tagged_text(self, taggedText):
+        self._paragraphCache.clear()
+        self._countedLines = 0
+
+        # Send the (text, tag) tuples to the text box.
+        # Adjacent runs with identical tags are merged,
+        # and the resulting segments are sent in batches,
+        # so only a few Tcl calls are needed.
+        segments = []
+        # list of [list of str, tuple of tags]
+        for entry in taggedText:
+            if len(entry) == 2:
+                # entry is a regular (text, tag) tuple.
+                text, tags = entry
+                if isinstance(tags, str):
+                    tags = (tags,) if tags else ()
+                else:
+                    tags = tuple(tags)
+                if segments and segments[-1][1] == tags:
+                    segments[-1][0].append(text)
+                else:
+                    segments.append([[text], tags])
+            else:
+                # entry is a mark to insert.
+                self._insert_segments(segments)
+                segments.clear()
+                index = f"{self.count('1.0', 'end', 'lines')[0]}.0"
+                self._textMarks[entry] = index
+        self._insert_segments(segments)
+
+        self.edit_reset()
+        # this is to prevent the user from clearing the box with Ctrl-Z
+        self.mark_set('insert', f'1.0')
+
+    def _insert_segments(self, segments):
+        # Insert a list of [list of str, tuple of tags] segments
+        # at the end, using one Tcl call per INSERT_CHUNK_SIZE segments.
+        for i in range(0, len(segments), self.INSERT_CHUNK_SIZE):
+            args = []
+            for textParts, tags in segments[i:i + self.INSERT_CHUNK_SIZE]:
+                args.append(''.join(textParts))
+                args.append(tags)
+            self.insert('end', *args)
+
+    def _is_tagged(self, tag, start, end):
+        # Return True if all characters between start and end have the tag.
+        # Tag ranges are maximal, so one range must cover the whole span.
+        tagRange = self.tag_prevrange(tag, f'{start}+1c')
+        return bool(tagRange) and self.compare(tagRange[1], '>=', end)
+
     def _lower(self, text):
         return text.lower()
 
+    def _overlaps_tag(self, tag, start, end):
+        # Return True if any character between start and end has the tag.
+        if tag in self.tag_names(start):
+            return True
+
+        return bool(self.tag_nextrange(tag, start, end))
+
     def _replace_selected(self, modify, modFirst=None):
         if not self.tag_ranges('sel'):
             return
 
+        # Split the selection into runs of characters with the same tags.
+        selFirst = self.index('sel.first')
+        tags = [tag for tag in self.tag_names(selFirst) if tag != 'sel']
+        runs = []
+        # list of [index, list of str, tuple of tags]
+        dump = self.tk.splitlist(
+            self.tk.call(
+                self._w, 'dump', '-text', '-tag', 'sel.first', 'sel.last'
+            )
+        )
+        items = iter(dump)
+        for key, value, index in zip(items, items, items):
+            if key == 'text':
+                if runs and runs[-1][2] == tuple(tags):
+                    runs[-1][1].append(value)
+                else:
+                    runs.append([str(index), [value], tuple(tags)])
+            elif value == 'sel':
+                continue
+
+            elif key == 'tagon':
+                if not value in tags:
+                    tags.append(value)
+            elif key == 'tagoff':
+                if value in tags:
+                    tags.remove(value)
+
+        # Modify the runs character by character.
+        changes = []
+        # list of (index, length, modified text, tags) tuples
+        newLength = 0
         modFirstWord = modFirst
-        self.mark_set('insert', 'sel.first')
-        index = 'sel.first'
-        n = self.count('sel.first', 'sel.last')[0]
-        for __ in range(n):
-            character = self.get(index)
-            if modFirstWord is not None:
-                modifiedCharacter = modFirstWord(character)
-                modFirstWord = None
-            else:
-                modifiedCharacter = modify(character)
-            if modFirst is not None and character in (' ', '\n'):
-                modFirstWord = modFirst
-
-            nextIndex = f'{index}+{len(modifiedCharacter)}c'
-            if modifiedCharacter != character:
-                selTags = self.tag_names(index)
-                self.delete(index)
-                selFirst = self.index('insert')
-                self.insert('insert', modifiedCharacter)
-                selLast = self.index('insert')
-                self.tag_add('sel', selFirst, selLast)
-                for tag in selTags:
-                    if tag != 'sel':
-                        self.tag_add((tag), index)
-            else:
-                self.mark_set('insert', nextIndex)
-            index = self.index(nextIndex)
-            if self.compare(index, '>=', 'end-1c'):
-                break
+        for index, textParts, runTags in runs:
+            text = ''.join(textParts)
+            modifiedCharacters = []
+            for character in text:
+                if modFirstWord is not None:
+                    modifiedCharacters.append(modFirstWord(character))
+                    modFirstWord = None
+                else:
+                    modifiedCharacters.append(modify(character))
+                if modFirst is not None and character in (' ', '\n'):
+                    modFirstWord = modFirst
+            modifiedText = ''.join(modifiedCharacters)
+            newLength += len(modifiedText)
+            if modifiedText != text:
+                changes.append((index, len(text), modifiedText, runTags))
+
+        # Replace the modified runs, starting from the end,
+        # so the indices of the preceding runs remain valid.
+        # Make the whole conversion one undo step.
+        autoSeparators = self.cget('autoseparators')
+        self.configure(autoseparators=False)
+        self.edit_separator()
+        for index, length, modifiedText, runTags in reversed(changes):
+            self.delete(index, f'{index}+{length}c')
+            self.insert(index, modifiedText, runTags)
+        self.edit_separator()
+        self.configure(autoseparators=autoSeparators)
+
+        self.tag_add('sel', selFirst, f'{selFirst}+{newLength}c')
+        self.mark_set('insert', 'sel.last')
+
+    def _get_unchanged_lines(self, channel):
+        # Return the numbers of leading and trailing lines
+        # not changed since the channel's last reset.
+        top, bottom = self.tk.splitlist(
+            self.tk.call('set', f'::nvwriter::clean({self._w},{channel})')
+        )
+        return int(top), int(bottom)
+
+    def _reset_change_tracker(self, channel, lineCount):
+        # Mark the first and last lineCount lines as unchanged.
+        self.tk.call(
+            'set',
+            f'::nvwriter::clean({self._w},{channel})',
+            (lineCount, lineCount),
+        )
+
+    def _serialize_paragraphs(self):
+        # Feed the whole text to the text parser, line by line.
+        # Re-use the XML of the lines not changed since the last call.
+        lineCount = int(self.index('end-1c').split('.')[0])
+        top, bottom = self._get_unchanged_lines(XML_CHANNEL)
+        cache = self._paragraphCache
+        bottom = min(bottom, len(cache), lineCount)
+        top = min(top, len(cache) - bottom, lineCount - bottom)
+        offset = len(cache) - lineCount
+        # line index shift for the unchanged lines at the end
+
+        newCache = []
+        for i in range(lineCount):
+            if i < top or i >= lineCount - bottom:
+                if i < top:
+                    entry = cache[i]
+                else:
+                    entry = cache[i + offset]
+                startState, xmlString, endState = entry
+                if startState == self._textParser.get_state():
+                    self._textParser.append_xml(xmlString)
+                    self._textParser.set_state(endState)
+                    newCache.append(entry)
+                    continue
+
+            # The line is new, changed, or its context has changed.
+            startState = self._textParser.get_state()
+            position = self._textParser.get_position()
+            self._dump_to_parser(f'{i + 1}.0', f'{i + 2}.0')
+            newCache.append(
+                (
+                    startState,
+                    self._textParser.get_xml_since(position),
+                    self._textParser.get_state(),
+                )
+            )
+        self._paragraphCache = newCache
+        self._reset_change_tracker(XML_CHANNEL, lineCount)
 
     def _set_format(self, newTag):
         # Apply newTag to the selected text.
@@ -285,18 +609,7 @@ class EditorBox(tk.Text):
             return False
 
         # Is the new tag already applied to the entire selection?
-        willModify = False
-        index = 'sel.first'
-        while self.compare(index, '<=', 'sel.last'):
-            if not newTag in self.tag_names(index):
-                willModify = True
-                break
-
-            index = self.index(f'{index}+1c')
-            if self.compare(index, '>=', 'end-1c'):
-                break
-
-        if not willModify:
+        if self._is_tagged(newTag, 'sel.first', 'sel.last'):
             return False
 
         # Insert the new tag before the first character's
@@ -0,0 +1,44 @@
+"""Provide functions that parse novx section content with expat.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from xml.parsers import expat
+
+
+def check_content(xmlString):
+    """Raise expat.ExpatError if xmlString is not well-formed.
+
+    No handlers are called, so this is much faster than parsing.
+    """
+    parser = expat.ParserCreate()
+    parser.Parse('<content>', False)
+    parser.Parse(xmlString, False)
+    parser.Parse('</content>', True)
+
+
+def parse_content(xmlString, handler):
+    """Parse novx section content, calling the handler's methods.
+
+    Positional arguments:
+        xmlString: str -- section content.
+        handler -- object with the startElement(), endElement(),
+                   and characters() methods of a sax.ContentHandler.
+
+    This is a replacement for sax.parseString(), bypassing the SAX driver:
+    - The handler methods are called directly by expat.
+    - Attributes are passed as a dict.
+    - Adjacent character data is passed with a single call.
+    - The content is not copied for wrapping it in a root element.
+
+    Raise expat.ExpatError in case of malformed XML.
+    """
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.startElement
+    parser.EndElementHandler = handler.endElement
+    parser.CharacterDataHandler = handler.characters
+    parser.Parse('<content>', False)
+    parser.Parse(xmlString, False)
+    parser.Parse('</content>', True)
@@ -4,6 +4,9 @@ Copyright (c) Peter Triesberger
 For further information see https://github.com/peter88213/nv_writer
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
 from nvwriter.comment import Comment
 
 
@@ -16,10 +19,12 @@ class Note(Comment):
         self.text = ''
 
     def get_xml(self):
+        # The text is not edited, so it is kept as read by the novx parser.
         return(
-            f'<note id="{self.noteId}" class="{self.noteClass}">'
-            f'<note-citation>{self.noteCitation}</note-citation>'
-            f'<p>{self.text}</p>'
+            f'<note id={quoteattr(self.noteId)}'
+            f' class={quoteattr(self.noteClass)}>'
+            f'<note-citation>{escape(self.noteCitation)}</note-citation>'
+            f'<p>{escape(self.text)}</p>'
             '</note>'
         )
 
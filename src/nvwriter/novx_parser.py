@@ -7,9 +7,11 @@ For further information see https://github.com/peter88213/nv_writer
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 
+import re
 from xml import sax
 
 from nvwriter.comment import Comment
+from nvwriter.expat_reader import parse_content
 from nvwriter.note import Note
 from nvwriter.nvwriter_globals import BULLET
 from nvwriter.nvwriter_globals import COMMENT_PREFIX
@@ -27,6 +29,18 @@ from nvwriter.nvwriter_globals import T_NOTE
 from nvwriter.nvwriter_globals import T_SPAN
 from nvwriter.nvwriter_globals import T_UL
 
+PLAIN_CONTENT_EXCLUDED = (
+    re.compile('<(?!/?(?:p|em|strong)>)'),
+    re.compile('&(?!(?:amp|lt|gt|quot|apos);)'),
+    re.compile(']]>'),
+    re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\r\ud800-\udfff\ufffe\uffff]'),
+)
+# anything but untagged paragraphs, emphasis, predefined entities,
+# and characters that need no normalization;
+# separate patterns are faster, because most of them start with a literal
+PLAIN_CONTENT_SPLITTER = re.compile('(</?(?:p|em|strong)>)')
+# splits plain content into text and tags, alternately
+
 
 class NovxParser(sax.ContentHandler):
     """A novx section content parser."""
@@ -34,14 +48,22 @@ class NovxParser(sax.ContentHandler):
     def __init__(self):
         super().__init__()
 
+        self.useExpat = True
+        # if False, parse via the xml.sax driver
+
+        self.useFastPath = True
+        # if True, parse plain paragraphs without an XML parser
+
         self._taggedText = []
-        # list of (content, [tags]) tuples
+        # list of (content, (tags)) tuples
 
-        self._tags = []
-        # collection of Text tags belonging to one content
+        self._tagStack = [()]
+        # tuples of the Text tags belonging to the content,
+        # one entry per open element that adds a tag
 
-        self._spans = []
-        # span stack
+        self._tagTuples = {}
+        # key: (tuple of tags, tag), value: tuple of tags plus tag
+        # so text chunks with the same formatting share one tuple
 
         self.comments = []
         # list of Comment instances
@@ -60,8 +82,8 @@ class NovxParser(sax.ContentHandler):
 
     def feed(self, xmlString):
         self._taggedText.clear()
-        self._tags.clear()
-        self._spans.clear()
+        self._tagStack[:] = [()]
+        # the stack may be broken after malformed content
         self.comments.clear()
         self.notes.clear()
         self._list = False
@@ -69,7 +91,15 @@ class NovxParser(sax.ContentHandler):
         self._commentXmlTag = None
         self._sectionStart = True
 
-        if xmlString:
+        if not xmlString:
+            return
+
+        if self.useFastPath and self._feed_plain_content(xmlString):
+            return
+
+        if self.useExpat:
+            parse_content(xmlString, self)
+        else:
             sax.parseString(f'<content>{xmlString}</content>', self)
 
     def characters(self, content):
@@ -97,21 +127,15 @@ class NovxParser(sax.ContentHandler):
             return
 
         #--- Process regular text.
-        tags = []
-        if self._tags:
-            self._tags.reverse()
-            tags.extend(self._tags)
-        self._taggedText.append((content, tags))
+        self._taggedText.append((content, self._tagStack[-1]))
 
     def endElement(self, name):
         if name == T_COMMENT:
             # Generate a tag using the list index of the Comment instance.
-            tags = [
+            tags = (
                 T_COMMENT,
                 f'{COMMENT_PREFIX}:{len(self.comments)-1}',
-            ]
-            if self._tags:
-                tags.extend(self._tags)
+            ) + self._tagStack[-1]
             # Use the comment's text, tagged with the comment's list index.
             self._taggedText.append((self.comments[-1].text, tags))
             self._commentXmlTag = None
@@ -119,29 +143,25 @@ class NovxParser(sax.ContentHandler):
 
         if name == T_NOTE:
             # Generate a tag using the list index of the Note instance.
-            tags = [
+            tags = (
                 T_NOTE,
                 f'{NOTE_PREFIX}:{len(self.notes)-1}',
-            ]
-            if self._tags:
-                tags.extend(self._tags)
+            ) + self._tagStack[-1]
             # Use the note's text, tagged with the comment's list index.
             self._taggedText.append((NOTE_MARK, tags))
             self._noteXmlTag = None
             return
 
-        if name in EMPHASIZING_TAGS:
-            self._tags.remove(name)
-            return
-
-        if name == T_SPAN:
-            self._tags.remove(self._spans.pop())
+        if name in EMPHASIZING_TAGS or name == T_SPAN:
+            if self._commentXmlTag is None and self._noteXmlTag is None:
+                # Elements are properly nested within a paragraph,
+                # so the element's tag is on top of the stack.
+                self._tagStack.pop()
             return
 
         if name in PARAGRAPH_TAGS:
             if self._commentXmlTag is None and self._noteXmlTag is None:
-                self._spans.clear()
-                self._tags.clear()
+                del self._tagStack[1:]
             return
 
         if name == T_UL:
@@ -203,26 +223,20 @@ class NovxParser(sax.ContentHandler):
                 suffix = '\n'
                 # newline character, finishing the previous paragraph
             if attributes:
-                span = f"{name}_{'_'.join(attributes)}"
-                self._spans.append(span)
-                self._tags.append(span)
+                self._push_tag(f"{name}_{'_'.join(attributes)}")
 
         elif name in EMPHASIZING_TAGS:
-            self._tags.append(name)
+            self._push_tag(name)
 
         elif name == T_SPAN:
             # Generate a tag using the XMl tag and all attributes.
-            span = f"{name}_{'_'.join(attributes)}"
-            self._spans.append(span)
-            self._tags.append(span)
+            self._push_tag(f"{name}_{'_'.join(attributes)}")
 
         elif name in HEADING_TAGS:
             if attributes:
-                span = f"{name}_{'_'.join(attributes)}"
-                self._spans.append(span)
-                self._tags.append(span)
+                self._push_tag(f"{name}_{'_'.join(attributes)}")
             else:
-                self._tags.append(name)
+                self._push_tag(name)
             if self._taggedText:
                 suffix = '\n'
 
@@ -240,3 +254,77 @@ class NovxParser(sax.ContentHandler):
 
         if suffix:
             self._taggedText.append((suffix, ''))
+
+    def _feed_plain_content(self, xmlString):
+        # Fast path for sections made of untagged paragraphs
+        # with emphasis only, producing the same result as the parser.
+        # Return False without any result if xmlString is out of scope,
+        # or malformed, so the parser can handle it.
+        for pattern in PLAIN_CONTENT_EXCLUDED:
+            if pattern.search(xmlString):
+                return False
+
+        hasEntities = '&' in xmlString
+        tokens = iter(PLAIN_CONTENT_SPLITTER.split(xmlString))
+        taggedText = []
+        tagStack = [()]
+        openElements = []
+        text = next(tokens)
+        while True:
+            if text:
+                if hasEntities and '&' in text:
+                    text = (
+                        text.replace('&lt;', '<')
+                        .replace('&gt;', '>')
+                        .replace('&quot;', '"')
+                        .replace('&apos;', "'")
+                        .replace('&amp;', '&')
+                    )
+                taggedText.append((text, tagStack[-1]))
+            tag = next(tokens, None)
+            if tag is None:
+                break
+
+            text = next(tokens)
+            if tag == '<p>':
+                if taggedText:
+                    taggedText.append(('\n', ''))
+                    # finishing the previous paragraph
+                openElements.append('p')
+            elif tag == '</p>':
+                if not openElements or openElements.pop() != 'p':
+                    return False
+
+                del tagStack[1:]
+            elif tag[1] == '/':
+                name = tag[2:-1]
+                if not openElements or openElements.pop() != name:
+                    return False
+
+                if len(tagStack) == 1:
+                    return False
+
+                tagStack.pop()
+            else:
+                name = tag[1:-1]
+                tagStack.append(self._get_tags(tagStack[-1], name))
+                openElements.append(name)
+        if openElements:
+            return False
+
+        self._taggedText.extend(taggedText)
+        return True
+
+    def _get_tags(self, tags, tag):
+        # Return the interned tuple of tag plus tags.
+        # The innermost tag comes first, because the editor box
+        # must get the tags in this order to dump them properly nested.
+        key = (tags, tag)
+        newTags = self._tagTuples.get(key, None)
+        if newTags is None:
+            newTags = self._tagTuples[key] = (tag,) + tags
+        return newTags
+
+    def _push_tag(self, tag):
+        # Put the tuple of tag plus the current tags on the stack.
+        self._tagStack.append(self._get_tags(self._tagStack[-1], tag))
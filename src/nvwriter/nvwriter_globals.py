@@ -74,6 +74,7 @@ for editorFont in FONTS:
 DEFAULT_FONT = editorFont
 
 PRJ_CONFIG_FILE = 'nv_writer.ini'
+JOURNAL_FILE = 'nv_writer.journal'
 RECENT = 'RECENT'
 RECENT_SECTION = 'section_ID'
 RECENT_POSITION = 'position'
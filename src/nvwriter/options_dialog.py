@@ -223,6 +223,32 @@ class OptionsDialog(ModalDialog):
             command=change_live_wc,
         ).pack(padx=5, pady=5, anchor='w',)
 
+        #--- Live word count delay entry.
+        def change_wc_delay(event):
+            try:
+                wordcountDelay = wcDelayVar.get()
+            except:
+                pass
+            else:
+                if wordcountDelay < 0:
+                    wordcountDelay = 0
+                prefs['wordcount_delay'] = wordcountDelay
+            wcDelayVar.set(prefs['wordcount_delay'])
+
+        ttk.Label(
+            liveFrame,
+            text=_('Delay (ms)'),
+        ).pack(padx=5, pady=5, anchor='w',)
+        wcDelayVar = tk.IntVar(
+            value=prefs['wordcount_delay']
+        )
+        wcDelayEntry = ttk.Entry(
+            liveFrame,
+            textvariable=wcDelayVar,
+        )
+        wcDelayEntry.pack(padx=5, pady=5, anchor='w',)
+        wcDelayEntry.bind('<Return>', change_wc_delay)
+
         ttk.Separator(
             optionsFrame,
             orient='vertical'
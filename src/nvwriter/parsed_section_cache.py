@@ -0,0 +1,76 @@
+"""Provide a class that keeps the parser results of recent sections.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from collections import OrderedDict
+from copy import deepcopy
+
+
+class ParsedSectionCache:
+    """Least recently used NovxParser results, keyed by section and content.
+
+    The comments and notes are copied when stored and when retrieved,
+    so changes made in the editor cannot affect the cached entries.
+    """
+
+    def __init__(self, capacity):
+        """Set up an empty cache.
+
+        Positional arguments:
+            capacity: int -- maximum number of cached sections.
+        """
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        # key: (section ID, content hash),
+        # value: (tagged text, comments, notes)
+
+    def __contains__(self, key):
+        # key: (section ID, content hash)
+        return key in self._entries
+
+    def clear(self):
+        self._entries.clear()
+
+    def get(self, scId, contentHash):
+        """Return (tagged text, comments, notes), or None if not cached.
+
+        Positional arguments:
+            scId: str -- section ID.
+            contentHash: int -- hash of the section content.
+        """
+        key = (scId, contentHash)
+        entry = self._entries.get(key, None)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        taggedText, comments, notes = entry
+        return list(taggedText), deepcopy(comments), deepcopy(notes)
+
+    def put(self, scId, contentHash, taggedText, comments, notes):
+        """Store the parser results of a section.
+
+        Positional arguments:
+            scId: str -- section ID.
+            contentHash: int -- hash of the section content.
+            taggedText: list -- (text, tags) tuples
+                                as returned by NovxParser.get_result().
+            comments: list -- Comment instances referenced by the tags.
+            notes: list -- Note instances referenced by the tags.
+
+        Entries of the same section with a different content are dropped.
+        """
+        if self.capacity < 1:
+            return
+
+        for key in [key for key in self._entries if key[0] == scId]:
+            del self._entries[key]
+        self._entries[(scId, contentHash)] = (
+            tuple(taggedText),
+            deepcopy(comments),
+            deepcopy(notes),
+        )
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
@@ -6,18 +6,29 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from xml import sax
 
+from nvwriter.expat_reader import parse_content
 from nvwriter.nvwriter_globals import PARAGRAPH_NESTING_TAGS
 from nvwriter.nvwriter_globals import PARAGRAPH_TAGS
 
 
 class SectionContentValidator(sax.ContentHandler):
 
+    def __init__(self):
+        super().__init__()
+        self.useExpat = True
+        # if False, parse via the xml.sax driver
+
     def validate_section(self, xmlString):
         # Raise RuntimeError if xmlString contains text that is not
         # enclosed with paragraph-defining XML tags.
         self.text = False
         self.nestedParagraph = False
-        if xmlString:
+        if not xmlString:
+            return
+
+        if self.useExpat:
+            parse_content(xmlString, self)
+        else:
             sax.parseString(f'<content>{xmlString}</content>', self)
 
     def characters(self, __):
@@ -0,0 +1,150 @@
+"""Provide a class for an append-only journal of section contents.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+
+
+class SectionJournal:
+    """Section contents not yet written to the project file.
+
+    The journal is a text file, starting with a header line
+    that identifies the project and the state of the project file
+    the journal is based on. Each record consists of a line
+    with the section ID and the content length, followed by the
+    section content and a line break.
+    Records of section contents autosaved from the editor,
+    but not applied to the section, are marked as drafts.
+    A record truncated by a crash is ignored when reading.
+    The whole journal is ignored if the project file has been saved
+    since the journal was begun.
+    """
+    HEADER = 'nv_writer journal'
+    DRAFT = 'draft'
+
+    def __init__(self, filePath, projectPath):
+        """Set up the journal.
+
+        Positional arguments:
+            filePath: str -- path to the journal file.
+            projectPath: str -- path to the novelibre project file.
+        """
+        self.filePath = filePath
+        self._projectPath = projectPath
+
+    def append(self, scId, sectionContent, draft=False):
+        """Add a record to the journal.
+
+        Positional arguments:
+            scId: str -- section ID.
+            sectionContent: str -- section content in novx format.
+        
+        Optional arguments:
+            draft: bool -- if True, the content is not applied 
+                           to the section.
+
+        Begin a new journal if there is none for the current state
+        of the project file.
+        """
+        header = self._get_header()
+        try:
+            with open(self.filePath, 'r', encoding='utf-8', newline='') as f:
+                isCurrent = f.readline() == header
+        except FileNotFoundError:
+            isCurrent = False
+        if isCurrent:
+            mode = 'a'
+        else:
+            mode = 'w'
+        with open(self.filePath, mode, encoding='utf-8', newline='') as f:
+            if not isCurrent:
+                f.write(header)
+            f.write(self._get_record(scId, sectionContent, draft))
+
+    def clear(self):
+        """Delete the journal file, if any."""
+        try:
+            os.remove(self.filePath)
+        except FileNotFoundError:
+            pass
+
+    def compact(self, sections):
+        """Rewrite the journal with one record per section.
+
+        Positional arguments:
+            sections: dict -- Section instances of the novel, by ID.
+
+        Write the current content of the journaled sections.
+        Drop the records of deleted sections, and the drafts.
+        """
+        records = [
+            self._get_record(scId, sections[scId].sectionContent or '')
+            for scId in self.read()
+            if scId in sections
+        ]
+        if not records:
+            self.clear()
+            return
+
+        tempPath = f'{self.filePath}.tmp'
+        with open(tempPath, 'w', encoding='utf-8', newline='') as f:
+            f.write(self._get_header())
+            f.writelines(records)
+        os.replace(tempPath, self.filePath)
+
+    def read(self, drafts=False):
+        """Return a dict with the latest content per section ID.
+
+        Optional arguments:
+            drafts: bool -- if True, return the drafts written after
+                            the section content was last applied.
+
+        Read the journal sequentially in one pass.
+        Return an empty dict if there is no journal for this project,
+        or if the project file has been saved since the journal was begun.
+        """
+        entries = {}
+        try:
+            with open(self.filePath, 'r', encoding='utf-8', newline='') as f:
+                if f.readline() != self._get_header():
+                    return entries
+
+                while True:
+                    line = f.readline()
+                    if not line.endswith('\n'):
+                        break
+
+                    scId, length, *kind = line[:-1].split(' ')
+                    length = int(length)
+                    sectionContent = f.read(length)
+                    if len(sectionContent) != length or f.read(1) != '\n':
+                        break
+
+                    if (kind == [self.DRAFT]) == drafts:
+                        entries[scId] = sectionContent
+                    elif drafts:
+                        # The section content was applied after the draft.
+                        entries.pop(scId, None)
+        except:
+            pass
+        return entries
+
+    def _get_header(self):
+        # Identify the project and the current state of its file.
+        try:
+            stat = os.stat(self._projectPath)
+        except OSError:
+            fileState = '0 0'
+        else:
+            fileState = f'{stat.st_mtime_ns} {stat.st_size}'
+        projectName = os.path.basename(self._projectPath)
+        return f'{self.HEADER} {projectName} {fileState}\n'
+
+    def _get_record(self, scId, sectionContent, draft=False):
+        if draft:
+            kind = f' {self.DRAFT}'
+        else:
+            kind = ''
+        return f'{scId} {len(sectionContent)}{kind}\n{sectionContent}\n'
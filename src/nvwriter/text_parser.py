@@ -6,18 +6,26 @@ Copyright (c) Peter Triesberger
 For further information see https://github.com/peter88213/nv_writer
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
-from xml import sax
+import re
+from xml.parsers import expat
 
-from nvlib.model.xml.xml_filter import strip_illegal_characters
+from nvwriter.expat_reader import check_content
 from nvwriter.nvwriter_globals import BULLET
 from nvwriter.nvwriter_globals import COMMENT_PREFIX
 from nvwriter.nvwriter_globals import EMPHASIZING_TAGS
 from nvwriter.nvwriter_globals import NOTE_PREFIX
+from nvwriter.nvwriter_globals import PARAGRAPH_NESTING_TAGS
 from nvwriter.nvwriter_globals import PARAGRAPH_TAGS
 from nvwriter.nvwriter_globals import T_LI
 from nvwriter.nvwriter_globals import T_SPAN
 from nvwriter.nvwriter_globals import T_UL
 
+ILLEGAL_CHARACTERS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f|]')
+# the same characters as removed by nvlib's strip_illegal_characters(),
+# including the vertical bar
+UNSAFE_CHARACTERS = re.compile('[&<>\x00-\x08\x0b\x0c\x0e-\x1f|]')
+# characters to be escaped or removed
+
 
 class TextParser():
     """A ttk.Text content parser."""
@@ -50,20 +58,87 @@ class TextParser():
         self._span = None
         self._format = None
         self._transferStack = []
-        self._spanNames = []
+        self._fixedLength = 0
+        # int: length of the XML list part that must not be modified
+
+        # Validation of the generated XML.
+        self._validate = False
+        self._strict = False
+        self._isValid = True
+        self._textAllowed = False
+        self._nestedParagraph = False
 
     @property
     def _list(self):
         return T_UL in self._xmlStack
 
-    def reset(self, debug=False):
+    def reset(self, debug=False, validate=False, strict=False):
+        """Prepare the parser for a new text.
+        
+        Optional arguments:
+            debug: bool -- if True, print the parsed items.
+            validate: bool -- if True, get_result() raises RuntimeError 
+                              if the generated elements are not properly
+                              nested, or contains text that is not
+                              enclosed with paragraph tags.
+            strict: bool -- if True, the validation also parses the
+                            generated XML to make sure it is well-formed.
+                            This is implied in debug mode.
+        """
         self._paragraph = False
         self._xmlList.clear()
         self._commentIndex = None
         self._noteIndex = None
         self._xmlStack.clear()
         self._transferStack.clear()
+        self._fixedLength = 0
         self.debug = debug
+        self._validate = validate
+        self._strict = strict or debug
+        self._isValid = True
+        self._textAllowed = False
+        self._nestedParagraph = False
+
+    def get_state(self):
+        """Return a hashable snapshot of the parser state."""
+        if self._commentIndex is None:
+            commentText = None
+        else:
+            # Comments may span several lines.
+            commentText = self.comments[self._commentIndex].text
+        return (
+            self._paragraph,
+            self._commentIndex,
+            commentText,
+            self._noteIndex,
+            self._span,
+            self._format,
+            tuple(self._xmlStack),
+            tuple(self._transferStack),
+            self._isValid,
+            self._textAllowed,
+            self._nestedParagraph,
+        )
+
+    def get_xml_since(self, position):
+        """Return the XML generated since the position marker."""
+        return ''.join(self._xmlList[position:])
+
+    def parse_dump(self, dump):
+        """Parse a flat list of (key, value, index) items from Text.dump."""
+        handlers = dict(
+            text=self.characters,
+            tagon=self.startElement,
+            tagoff=self.endElement,
+        )
+        items = iter(dump)
+        for key, value, __ in zip(items, items, items):
+            if self.debug:
+                print(key, value)
+            if value:
+                handler = handlers.get(key, None)
+                if handler is not None:
+                    handler(value)
 
     def parse_triple(self, key, value, __):
         if self.debug:
@@ -78,8 +153,15 @@ class TextParser():
     def characters(self, content):
 
         # Sanitize content for XML use.
-        content = sax.saxutils.escape(content)
-        content = strip_illegal_characters(content)
+        # Most text has nothing to be escaped or removed,
+        # so look for it with a single scan before.
+        if UNSAFE_CHARACTERS.search(content):
+            content = ILLEGAL_CHARACTERS.sub(
+                '',
+                content.replace('&', '&amp;')
+                .replace('<', '&lt;')
+                .replace('>', '&gt;')
+            )
 
         if self._commentIndex is not None:
 
@@ -120,16 +202,22 @@ class TextParser():
         if content.endswith('\n'):
 
             # Content ends the current paragraph.
-            self._xmlList.append(content.rstrip('\n'))
+            content = content.rstrip('\n')
             # removing the linebreak
 
+            self._validate_text(content)
+            if content:
+                self._xmlList.append(content)
+
             self._end_paragraph()
 
             if self._list:
                 self._end_xml()
             return
 
-        self._xmlList.append(content)
+        self._validate_text(content)
+        if content:
+            self._xmlList.append(content)
 
     def endElement(self, name):
         if name in EMPHASIZING_TAGS:
@@ -162,11 +250,55 @@ class TextParser():
             self._noteIndex = None
             return
 
+    def append_xml(self, xmlString):
+        """Append already converted XML to the result."""
+        self._xmlList.append(xmlString)
+
+    def get_position(self):
+        """Return a position marker for get_xml_since().
+
+        The XML generated before the marker is not modified any more.
+        """
+        self._fixedLength = len(self._xmlList)
+        return self._fixedLength
+
     def get_result(self):
         while self._xmlStack:
             # The final paragraph was a list element, so close the list.
             self._end_xml()
-        return self._remove_redundant_tags(''.join(self._xmlList))
+        if self._validate and not self._isValid:
+            raise RuntimeError('Section content validation failed')
+
+        xmlString = ''.join(self._xmlList)
+        if self._validate and self._strict:
+            # Text and attribute values are escaped when generated,
+            # so a parser run is only needed to catch programming errors.
+            try:
+                check_content(xmlString)
+            except expat.ExpatError as ex:
+                raise RuntimeError(f'Section content is not well-formed: {ex}')
+
+        return xmlString
+
+    def set_state(self, state):
+        """Restore a parser state snapshot taken with get_state()."""
+        (
+            self._paragraph,
+            self._commentIndex,
+            commentText,
+            self._noteIndex,
+            self._span,
+            self._format,
+            xmlStack,
+            transferStack,
+            self._isValid,
+            self._textAllowed,
+            self._nestedParagraph,
+        ) = state
+        self._xmlStack[:] = xmlStack
+        self._transferStack[:] = transferStack
+        if self._commentIndex is not None:
+            self.comments[self._commentIndex].text = commentText
 
     def startElement(self, name):
         if name.startswith(COMMENT_PREFIX):
@@ -195,11 +327,15 @@ class TextParser():
         if name.startswith(T_SPAN):
             self._span = name
             self._start_xml(name)
-            xmlName = name.replace("_", " ")
-            if not xmlName in self._spanNames:
-                self._spanNames.append(xmlName)
             return
 
+    def _append_end_tag(self, tag):
+        if tag == T_SPAN and self._get_last_xml().startswith(f'<{T_SPAN} '):
+            # Drop the empty span instead of closing it.
+            del self._xmlList[-1]
+        else:
+            self._xmlList.append(f'</{tag}>')
+
     def _end_paragraph(self):
         self._paragraph = False
 
@@ -210,7 +346,8 @@ class TextParser():
             tag = self._xmlStack.pop()
             if self.debug:
                 print(f'* Closing {tag}')
-            self._xmlList.append(f'</{tag}>')
+            self._append_end_tag(tag)
+            self._validate_end(tag)
             if not tag in PARAGRAPH_TAGS:
                 self._transferStack.append(tag)
             else:
@@ -221,14 +358,15 @@ class TextParser():
             tag = self._xmlStack.pop()
             if self.debug:
                 print(f'* Closing {tag}')
-            self._xmlList.append(f'</{tag}>')
+            self._append_end_tag(tag)
+            self._validate_end(tag)
+
+    def _get_last_xml(self):
+        # Return the last XML generated, if it may still be modified.
+        if len(self._xmlList) > self._fixedLength:
+            return self._xmlList[-1]
 
-    def _remove_redundant_tags(self, text):
-        for name in EMPHASIZING_TAGS:
-            text = text.replace(f'</{name}><{name}>', '')
-        for name in self._spanNames:
-            text = text.replace(f'<{name}></{T_SPAN}>', '')
-        return text
+        return ''
 
     def _start_paragraph(self, name='p'):
         self._paragraph = True
@@ -243,10 +381,36 @@ class TextParser():
                 print(f'* Opening {tag}')
             self._xmlStack.append(tag)
             self._xmlList.append(f'<{tag}>')
+            self._validate_start(tag)
 
     def _start_xml(self, name):
         tag = name.split('_')[0]
         if self.debug:
             print(f'* Opening {tag}')
         self._xmlStack.append(tag)
-        self._xmlList.append(f'<{name.replace("_", " ")}>')
+        if tag in EMPHASIZING_TAGS and self._get_last_xml() == f'</{tag}>':
+            # Continue the element just closed
+            # instead of generating a redundant </em><em> pair.
+            del self._xmlList[-1]
+        else:
+            self._xmlList.append(f'<{name.replace("_", " ")}>')
+        self._validate_start(tag)
+
+    def _validate_end(self, tag):
+        # Track the end of a generated XML element for validation.
+        if not self._nestedParagraph and tag in PARAGRAPH_TAGS:
+            self._textAllowed = False
+        elif tag in PARAGRAPH_NESTING_TAGS:
+            self._nestedParagraph = False
+
+    def _validate_start(self, tag):
+        # Track the start of a generated XML element for validation.
+        if not self._nestedParagraph and tag in PARAGRAPH_TAGS:
+            self._textAllowed = True
+        elif tag in PARAGRAPH_NESTING_TAGS:
+            self._nestedParagraph = True
+
+    def _validate_text(self, text):
+        # Generated text must be enclosed with paragraph-defining XML tags.
+        if text and not self._textAllowed and not self._nestedParagraph:
+            self._isValid = False
@@ -0,0 +1,40 @@
+"""Provide a class that keeps the word count per line.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+
+
+class WordCountCache:
+    """Word count per line, with a running total.
+
+    The update() method does not access any widget,
+    so it can be called from a worker thread.
+    Updates must be applied in the order of the change snapshots.
+    """
+
+    def __init__(self, wordCounter):
+        """Set up an empty cache.
+
+        Positional arguments:
+            wordCounter -- object with a get_word_count(text) method.
+        """
+        self._wordCounter = wordCounter
+        self._counts = []
+        # list of int: number of words per line
+        self._total = 0
+
+    def update(self, top, bottom, lines):
+        """Count the words of the changed lines and return the total.
+
+        Positional arguments:
+            top: int -- number of unchanged leading lines.
+            bottom: int -- number of unchanged trailing lines.
+            lines: list of str -- the lines in between.
+        """
+        end = len(self._counts) - bottom
+        newCounts = [self._wordCounter.get_word_count(line) for line in lines]
+        self._total += sum(newCounts) - sum(self._counts[top:end])
+        self._counts[top:end] = newCounts
+        return self._total
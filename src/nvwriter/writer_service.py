@@ -6,12 +6,18 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 import os
 from pathlib import Path
+from tkinter import font as tkFont
 
 from nvlib.controller.sub_controller import SubController
 from nvlib.novx_globals import MANUSCRIPT_SUFFIX
 from nvlib.novx_globals import PROOF_SUFFIX
 from nvwriter.nvwriter_globals import DEFAULT_FONT
+from nvwriter.nvwriter_globals import DEFAULT_HEIGHT
 from nvwriter.nvwriter_globals import FEATURE
+from nvwriter.nvwriter_globals import MAX_CH_PER_LINE
+from nvwriter.nvwriter_globals import MIN_FONT_SIZE
+from nvwriter.nvwriter_globals import RESOLUTIONS
+from nvwriter.nvwriter_globals import SCROLLBAR_WIDTH
 from nvwriter.nvwriter_globals import prefs
 from nvwriter.scrollbar_styles import make_scrollbar_style
 from nvwriter.writer_locale import _
@@ -22,6 +28,7 @@ class WriterService(SubController):
     INI_FILENAME = 'writer.ini'
     INI_FILEPATH = '.novx/config'
     SETTINGS = dict(
+        autosave_interval=60,
         characters_per_line=80,
         color_ambient='#000000',
         color_bg='#262626',
@@ -35,14 +42,19 @@ class WriterService(SubController):
         color_status_fg='#262626',
         color_strong='#d9d9d9',
         editor_font=DEFAULT_FONT,
+        font_sizes='',
+        font_sizes_key='',
         padding_x=10,
         padding_y=10,
         resolution_index=1,
+        section_cache_size=10,
         spacing_line=4,
         spacing_paragraph=25,
+        wordcount_delay=500,
     )
     OPTIONS = dict(
         ask_for_confirmation=True,
+        force_validation=False,
         live_wordcount=False,
         show_footer_bar=True,
         show_help_screen=True,
@@ -52,6 +64,8 @@ class WriterService(SubController):
         self._mdl = model
         self._ui = view
         self._ctrl = controller
+        self.writer = None
+        # the WriterView instance, kept withdrawn between the sessions
 
         #--- Load configuration.
         try:
@@ -71,7 +85,37 @@ class WriterService(SubController):
         # Create the CustomScrollbarStyle object in tk.
         make_scrollbar_style()
 
+    def get_font_sizes(self):
+        """Return a list with the editor font size per screen resolution.
+        
+        The list is kept in the configuration, and calculated anew
+        only if the editor font, the horizontal padding, 
+        or the font metrics of the display have changed.
+        """
+        fontSizesKey = (
+            f"{prefs['editor_font']}|{prefs['padding_x']}|{MAX_CH_PER_LINE}"
+            f"|{self._get_line_length(MIN_FONT_SIZE)}"
+        )
+        if prefs['font_sizes_key'] == fontSizesKey:
+            try:
+                fontSizes = [int(s) for s in prefs['font_sizes'].split(',')]
+            except ValueError:
+                pass
+            else:
+                if len(fontSizes) == len(RESOLUTIONS):
+                    return fontSizes
+
+        fontSizes = self._calculate_font_sizes()
+        prefs['font_sizes'] = ','.join(str(s) for s in fontSizes)
+        prefs['font_sizes_key'] = fontSizesKey
+        return fontSizes
+
     def on_quit(self):
+        if self.writer is not None:
+            try:
+                self.writer.destroy()
+            except:
+                pass
 
         #--- Save configuration
         for keyword in prefs:
@@ -111,7 +155,14 @@ class WriterService(SubController):
             )
             return
 
-        self.writer = WriterView(self._mdl, self._ui, self._ctrl)
+        if self.writer is not None:
+            if self.writer.is_reusable():
+                self.writer.reopen()
+                return
+
+            if self.writer.winfo_exists():
+                self.writer.destroy()
+        self.writer = WriterView(self._mdl, self._ui, self._ctrl, self)
 
     def _active_documents(self):
         docTypes = {
@@ -129,3 +180,45 @@ class WriterService(SubController):
                     activeDocs.append(doc)
         return activeDocs
 
+    def _calculate_font_sizes(self):
+        # For each screen resolution, find the biggest font size
+        # that fits MAX_CH_PER_LINE characters into the text area.
+        # The line length grows with the font size,
+        # so a binary search can be used.
+
+        def fits(fontSize, textAreaWidth):
+            return self._get_line_length(fontSize) < textAreaWidth
+
+        fontSizes = []
+        fontSize = MIN_FONT_SIZE
+        # the smallest font size that might not fit
+        for height, width in RESOLUTIONS:
+            scale = height / DEFAULT_HEIGHT
+            paddingX = round(int(prefs['padding_x']) * scale)
+            textAreaWidth = width - (2 * paddingX) - SCROLLBAR_WIDTH
+
+            # Find a font size that does not fit, doubling the step width.
+            low = high = fontSize
+            step = 1
+            while fits(high, textAreaWidth):
+                low = high + 1
+                high += step
+                step *= 2
+
+            # Find the smallest font size between low and high
+            # that does not fit.
+            while low < high:
+                middle = (low + high) // 2
+                if fits(middle, textAreaWidth):
+                    low = middle + 1
+                else:
+                    high = middle
+            fontSize = low
+            fontSizes.append(fontSize - 1)
+        return fontSizes
+
+    def _get_line_length(self, fontSize):
+        # Return the width of a line of MAX_CH_PER_LINE characters
+        # in the editor font, in pixels.
+        font = tkFont.Font(family=prefs['editor_font'], size=fontSize)
+        return font.measure('0') * MAX_CH_PER_LINE
@@ -4,9 +4,10 @@ Copyright (c) Peter Triesberger
 For further information see https://github.com/peter88213/nv_writer
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 import os
-from tkinter import font as tkFont
+import queue
 from tkinter import ttk
 
 from nvlib.gui.widgets.modal_dialog import ModalDialog
@@ -14,33 +15,38 @@ from nvlib.novx_globals import CH_ROOT
 from nvwriter.editor_box import EditorBox
 from nvwriter.footer_bar import FooterBar
 from nvwriter.help_screen import HelpScreen
+from nvwriter.novx_parser import NovxParser
 from nvwriter.nvwriter_globals import DEFAULT_HEIGHT
 from nvwriter.nvwriter_globals import FEATURE
-from nvwriter.nvwriter_globals import MAX_CH_PER_LINE
-from nvwriter.nvwriter_globals import MIN_FONT_SIZE
+from nvwriter.nvwriter_globals import JOURNAL_FILE
 from nvwriter.nvwriter_globals import PRJ_CONFIG_FILE
 from nvwriter.nvwriter_globals import RECENT
 from nvwriter.nvwriter_globals import RECENT_POSITION
 from nvwriter.nvwriter_globals import RECENT_SECTION
 from nvwriter.nvwriter_globals import RESOLUTIONS
-from nvwriter.nvwriter_globals import SCROLLBAR_WIDTH
 from nvwriter.nvwriter_globals import check_editor_settings
 from nvwriter.nvwriter_globals import prefs
 from nvwriter.nvwriter_help import NvwriterHelp
+from nvwriter.parsed_section_cache import ParsedSectionCache
 from nvwriter.platform.platform_settings import KEYS
 from nvwriter.platform.platform_settings import PLATFORM
-from nvwriter.section_content_validator import SectionContentValidator
+from nvwriter.section_journal import SectionJournal
 from nvwriter.status_bar import StatusBar
+from nvwriter.word_count_cache import WordCountCache
 from nvwriter.writer_locale import _
 
 
 class WriterView(ModalDialog):
 
+    WC_POLL_INTERVAL = 50
+    # milliseconds between checks for background word count results
+
     def __init__(
         self,
         model,
         view,
         controller,
+        service,
     ):
         self._mdl = model
         self._ui = view
@@ -53,28 +59,42 @@ class WriterView(ModalDialog):
         self.wordCounter = self._mdl.nvService.get_word_counter()
         self._initialWc = 0
         self._actualWordCount = None
+        self._wordcountJob = None
+        # ID of the scheduled live word count, if any
+
+        # Count words in a worker thread.
+        self._wordCountCache = WordCountCache(self.wordCounter)
+        self._wcExecutor = ThreadPoolExecutor(max_workers=1)
+        # a single worker applies the line changes in order
+        self._wcResults = queue.Queue()
+        # (generation, future) tuples, put by the worker
+        self._wcGeneration = 0
+        # number of the latest change snapshot
+        self._wcReceived = 0
+        # number of the latest change snapshot whose result has arrived
+        self._wcPollJob = None
+
+        # Keep the parser results of recently used sections.
+        self._novxParser = NovxParser()
+        self._parsedSections = ParsedSectionCache(
+            int(prefs['section_cache_size'])
+        )
+        self._prefetchJob = None
+        # ID of the scheduled prefetch, if any
+        self._verifiedSections = {}
+        # key: section ID, value: hash of the section content
+        # that passed the validation in the current project
+
+        # Autosave the edited section to the journal.
+        self._autosaveJob = None
+        self._autosavedText = None
+        # section content written by the last autosave
 
         self.attributes('-fullscreen', True)
         check_editor_settings(self)
 
-        #--- Calculate the font sizes for various scales.
-
-        def get_x_sizes(height, width, fontSize):
-            scale = height / DEFAULT_HEIGHT
-            paddingX = round(int(prefs['padding_x']) * scale)
-            textAreaWidth = width - (2 * paddingX) - SCROLLBAR_WIDTH
-            font = tkFont.Font(family=prefs['editor_font'], size=fontSize)
-            lineLength = font.measure('0') * MAX_CH_PER_LINE
-            return lineLength, textAreaWidth
-
-        self._fontSizes = []
-        fontSize = MIN_FONT_SIZE
-        for height, width in RESOLUTIONS:
-            lineLength, textAreaWidth = get_x_sizes(height, width, fontSize)
-            while lineLength < textAreaWidth:
-                fontSize += 1
-                lineLength, textAreaWidth = get_x_sizes(height, width, fontSize)
-            self._fontSizes.append(fontSize - 1)
+        #--- Get the font sizes for various scales.
+        self._fontSizes = service.get_font_sizes()
 
         #--- Set the workspace.
         resolutionIndex = int(prefs['resolution_index'])
@@ -95,11 +115,8 @@ class WriterView(ModalDialog):
         self._statusBar.set_font(fontSize)
         self._statusBar.pack(fill='x')
 
-        #--- Add a help window to the editor window.
-        self._helpScreen = HelpScreen(
-            self._editorWindow,
-        )
-        self._helpScreen.set_font(fontSize, scale)
+        #--- The help window is created when shown for the first time.
+        self._helpScreen = None
 
         #--- Add a text editor with scrollbar to the editor window.
 
@@ -130,9 +147,8 @@ class WriterView(ModalDialog):
         )
         self._sectionEditor.pack(fill='both', expand=True)
 
-        #--- Add a footer bar to the editor window.
-        self._footerBar = FooterBar(self._editorWindow)
-        self._footerBar.set_font(fontSize)
+        #--- The footer bar is created when shown for the first time.
+        self._footerBar = None
 
         #--- Restore the previous session's layout.
         if prefs['show_footer_bar']:
@@ -196,50 +212,36 @@ class WriterView(ModalDialog):
 
         self.protocol("WM_DELETE_WINDOW", self.on_quit)
 
-        #--- Configure the editor.
-        self._set_wc_mode()
-        self._askForConfirmation = prefs['ask_for_confirmation']
-
-        #--- Provide validator, just for debugging.
-        self._validator = SectionContentValidator()
-
-        #--- Project-specific configuration
-        fields = self._mdl.novel.fields
-        fields.pop('writer-last-position', None)
-        self._mdl.novel.fields = fields
-        # removing entry from version 0.19.1, if any
-        # TODO: drop this when preparing the final release
-
-        prjDir, __ = os.path.split(self._mdl.prjFile.filePath)
-        self.prjConfigFile = os.path.join(prjDir, PRJ_CONFIG_FILE)
-        prjConfig = ConfigParser()
-        prjConfig.read(self.prjConfigFile)
-        try:
-            recent = prjConfig[RECENT]
-        except:
-            lastScId = lastCursorPos = None
-        else:
-            lastScId = recent.get(RECENT_SECTION, None)
-            lastCursorPos = recent.get(RECENT_POSITION, None)
-            if not self._is_editable(lastScId):
-                lastScId = lastCursorPos = None
+        self._standbyPrefs = None
+        # copy of the preferences when the window was withdrawn
+        self._recoveredNovel = None
+        # the novel already checked against the journal
 
-        #--- Load the section content into the text editor.
-        scId = self._ui.selectedNode
-        cursorPos = '1.0'
-        if self._is_editable(scId):
-            if scId == lastScId:
-                cursorPos = lastCursorPos
-        elif lastScId is not None:
-            scId = lastScId
-            cursorPos = lastCursorPos
-        else:
-            scId = self._get_first_editable_section()
-            if scId is None:
-                self.on_quit()
-                return
+        self._start_session()
 
-        self._load_section(scId, cursorPos=cursorPos)
+    def destroy(self):
+        """Stop all background activities and destroy the window.
+        
+        Extends the superclass method.
+        """
+        self._stop_wordcount()
+        self._cancel_prefetch()
+        self._cancel_autosave()
+        self._wcExecutor.shutdown(wait=False)
+        super().destroy()
+
+    def is_reusable(self):
+        """Return True if the withdrawn window can be shown again.
+        
+        This is not the case if the window was destroyed,
+        if the preferences were changed in the meantime,
+        or if another project was loaded.
+        """
+        return (
+            bool(self.winfo_exists())
+            and self._standbyPrefs == prefs
+            and self._mdl.novel is self._recoveredNovel
+        )
 
     def on_quit(self, event=None):
         """Exit the editor. Apply changes, if possible."""
@@ -258,8 +260,34 @@ class WriterView(ModalDialog):
         with open(self.prjConfigFile, 'w') as f:
             prjConfig.write(f)
 
+        self._stop_wordcount()
+        self._cancel_prefetch()
+        self._cancel_autosave()
+        if self._mdl.isModified:
+            try:
+                self._journal.compact(self._mdl.novel.sections)
+            except:
+                pass
+        else:
+            self._clear_journal()
+
+        # Keep the window for the next time.
+        self.grab_release()
+        self.withdraw()
+        self._standbyPrefs = dict(prefs)
         self._focus_app_window(True)
-        self.destroy()
+
+    def reopen(self):
+        """Show the withdrawn window again, and load a section."""
+        self._focus_app_window(False)
+        self.deiconify()
+        self.attributes('-fullscreen', True)
+        if not check_editor_settings(self):
+            # The settings were adjusted, e.g. to another screen.
+            self._reconfigure_screen()
+        self.grab_set()
+        self._sectionEditor.set_author_name(self._mdl.novel.authorName)
+        self._start_session()
 
     def _apply_changes(self, event=None):
         # Transfer the editor content to the project, if modified.
@@ -269,7 +297,7 @@ class WriterView(ModalDialog):
         sectionText = self._get_edited_section_content()
         if sectionText or self._section.sectionContent:
             if self._section.sectionContent != sectionText:
-                self._section.sectionContent = sectionText
+                self._set_section_content(sectionText)
 
     def _apply_changes_after_asking(self, event=None):
         """Transfer the editor content to the project.
@@ -287,9 +315,66 @@ class WriterView(ModalDialog):
                     return False
 
                 if result:
-                    self._section.sectionContent = sectionText
+                    self._set_section_content(sectionText)
         return True
 
+    def _autosave(self):
+        # Write the edited section to the journal as a draft, if modified.
+        # The editor serializes only the paragraphs changed since
+        # the last call, so this is cheap even for long sections.
+        self._autosaveJob = None
+        if self._sectionEditor.edit_modified():
+            try:
+                sectionText = self._sectionEditor.get_text()
+            except:
+                sectionText = None
+            if sectionText is not None and sectionText != self._autosavedText:
+                if self._write_journal(self._scId, sectionText, draft=True):
+                    self._autosavedText = sectionText
+        self._schedule_autosave()
+
+    def _cancel_autosave(self):
+        if self._autosaveJob is not None:
+            self.after_cancel(self._autosaveJob)
+            self._autosaveJob = None
+
+    def _check_journal(self):
+        # Offer the changes from the journal once per loaded project.
+        # When reopened, the window works on the same model,
+        # which is more recent than the journal.
+        if self._mdl.novel is not self._recoveredNovel:
+            self._verifiedSections.clear()
+            self._recover_sections()
+            self._recoveredNovel = self._mdl.novel
+
+    def _clear_journal(self):
+        # Call this when the project file is up to date.
+        try:
+            self._journal.clear()
+        except:
+            pass
+        self._autosavedText = None
+
+    def _cancel_prefetch(self):
+        if self._prefetchJob is not None:
+            self.after_cancel(self._prefetchJob)
+            self._prefetchJob = None
+
+    def _cancel_wordcount(self):
+        if self._wordcountJob is not None:
+            self.after_cancel(self._wordcountJob)
+            self._wordcountJob = None
+
+    def _count_words(self):
+        # Return the word count, waiting for the worker thread.
+        self._wcGeneration += 1
+        self._wcReceived = self._wcGeneration
+        # results of previous snapshots are outdated
+        return self._wcExecutor.submit(
+            self._wordCountCache.update,
+            *self._sectionEditor.get_changed_lines(),
+        ).result()
+
     def _capitalize(self, event=None):
         self._sectionEditor.capitalize()
         return 'break'
@@ -315,6 +400,7 @@ class WriterView(ModalDialog):
         """
         self._apply_changes()
         self._mdl.clone_section(self._scId)
+        self._index_editable_sections()
 
     def _create_section(self, event=None):
         # Create a new section after the currently edited section.
@@ -332,6 +418,7 @@ class WriterView(ModalDialog):
             scType=self._mdl.novel.sections[self._scId].scType,
             scene=sceneKind,
             )
+        self._index_editable_sections()
         # Go to the new section.
         self._load_next()
         self._askForConfirmation = False
@@ -381,8 +468,10 @@ class WriterView(ModalDialog):
 
     def _get_edited_section_content(self):
         try:
-            sectionText = self._sectionEditor.get_text()
-            self._validator.validate_section(sectionText)
+            sectionText = self._sectionEditor.get_text(
+                validate=True,
+                strict=prefs['force_validation'],
+            )
         except:
             savedText = self._sectionEditor.get('1.0', 'end')
             emergencyFile = f'{self._mdl.prjFile.filePath}_{self._scId}.txt'
@@ -398,23 +487,34 @@ class WriterView(ModalDialog):
             return sectionText
 
     def _get_first_editable_section(self):
-        result = None
-        for chId in self._mdl.novel.tree.get_children(CH_ROOT):
-            for scId in self._mdl.novel.tree.get_children(chId):
-                if self._is_editable(scId):
-                    result = scId
-                    break
-            if result is not None:
-                break
-        return result
+        if self._editableSections:
+            return self._editableSections[0]
+
+        return None
+
+    def _get_next_editable_section(self, scId):
+        i = self._editablePositions.get(scId, None)
+        if i is None or i + 1 >= len(self._editableSections):
+            return None
+
+        return self._editableSections[i + 1]
+
+    def _get_prev_editable_section(self, scId):
+        i = self._editablePositions.get(scId, None)
+        if i is None or i == 0:
+            return None
+
+        return self._editableSections[i - 1]
 
     def _hide_help_screen(self, event=None):
-        self._helpScreen.pack_forget()
+        if self._helpScreen is not None:
+            self._helpScreen.pack_forget()
         prefs['show_help_screen'] = False
         return 'break'
 
     def _hide_footer_bar(self, event=None):
-        self._footerBar.pack_forget()
+        if self._footerBar is not None:
+            self._footerBar.pack_forget()
         prefs['show_footer_bar'] = False
         return 'break'
 
@@ -426,6 +526,20 @@ class WriterView(ModalDialog):
             if check_editor_settings(self):
                 self._reconfigure_screen()
 
+    def _index_editable_sections(self):
+        # Build the navigation index of the editable sections.
+        # Call this after adding sections to the novel.
+        self._editableSections = []
+        # list of section IDs in tree order
+        for chId in self._mdl.novel.tree.get_children(CH_ROOT):
+            for scId in self._mdl.novel.tree.get_children(chId):
+                if self._is_editable(scId):
+                    self._editableSections.append(scId)
+        self._editablePositions = {
+            scId: i for i, scId in enumerate(self._editableSections)
+        }
+        # key: section ID, value: index in self._editableSections
+
     def _is_editable(self, scId):
         if not scId in self._mdl.novel.sections:
             return False
@@ -437,9 +551,7 @@ class WriterView(ModalDialog):
         if not self._apply_changes_after_asking():
             return
 
-        nextNode = self._ui.tv.next_node(self._scId)
-        while nextNode and not self._is_editable(nextNode):
-            nextNode = self._ui.tv.next_node(nextNode)
+        nextNode = self._get_next_editable_section(self._scId)
         if nextNode:
             self._load_section(nextNode)
 
@@ -448,9 +560,7 @@ class WriterView(ModalDialog):
         if not self._apply_changes_after_asking():
             return
 
-        prevNode = self._ui.tv.prev_node(self._scId)
-        while prevNode and not self._is_editable(prevNode):
-            prevNode = self._ui.tv.prev_node(prevNode)
+        prevNode = self._get_prev_editable_section(self._scId)
         if prevNode:
             self._load_section(prevNode)
 
@@ -461,11 +571,25 @@ class WriterView(ModalDialog):
         self._section = self._mdl.novel.sections[scId]
         self._scId = scId
         self._sectionEditor.clear()
+        self._cancel_prefetch()
+        self._autosavedText = None
+        contentHash = hash(self._section.sectionContent)
         try:
             msg = 'Cannot load text.'
-            self._sectionEditor.set_text(self._section.sectionContent)
-            msg = 'Validation error.'
-            self._validator.validate_section(self._sectionEditor.get_text())
+            parsedSection = self._parsedSections.get(scId, contentHash)
+            if parsedSection is None:
+                parsedSection = self._parse_section(scId, contentHash)
+            self._sectionEditor.set_parsed_text(*parsedSection)
+            if (
+                prefs['force_validation']
+                or self._verifiedSections.get(scId, None) != contentHash
+            ):
+                msg = 'Validation error.'
+                self._sectionEditor.get_text(
+                    validate=True,
+                    strict=prefs['force_validation'],
+                )
+                self._verifiedSections[scId] = contentHash
         except:
             self._emergency_exit(message=msg)
 
@@ -482,9 +606,7 @@ class WriterView(ModalDialog):
             self._mdl.novel.chapters[chId].title,
             self._section.title
         )
-        self._initialWc = self.wordCounter.get_word_count(
-            self._sectionEditor.get('1.0', 'end')
-        )
+        self._initialWc = self._count_words()
         self._show_wordcount(wc=self._initialWc)
         self._reset_modified_flag()
         self._sectionEditor.bind(
@@ -493,6 +615,13 @@ class WriterView(ModalDialog):
         )
         self._askForConfirmation = prefs['ask_for_confirmation']
         self._sectionEditor.focus()
+        self._prefetchJob = self.after_idle(
+            self._prefetch_sections,
+            [
+                self._get_next_editable_section(scId),
+                self._get_prev_editable_section(scId),
+            ]
+        )
 
     def _open_help(self, event=None):
         NvwriterHelp.open_help_page('operation.html')
@@ -503,6 +632,65 @@ class WriterView(ModalDialog):
             self._statusBar.set_modified(True)
         return 'break'
 
+    def _parse_section(self, scId, contentHash):
+        # Return (tagged text, comments, notes), and cache a copy.
+        self._novxParser.feed(self._mdl.novel.sections[scId].sectionContent)
+        parsedSection = (
+            list(self._novxParser.get_result()),
+            list(self._novxParser.comments),
+            list(self._novxParser.notes),
+        )
+        self._parsedSections.put(scId, contentHash, *parsedSection)
+        return parsedSection
+
+    def _prefetch_sections(self, scIds):
+        # Parse the sections in advance,
+        # one section per idle callback, so the editor stays responsive.
+        self._prefetchJob = None
+        while scIds:
+            scId = scIds.pop(0)
+            if not scId:
+                continue
+
+            contentHash = hash(self._mdl.novel.sections[scId].sectionContent)
+            if (scId, contentHash) in self._parsedSections:
+                continue
+
+            try:
+                self._parse_section(scId, contentHash)
+            except:
+                # Leave the error to _load_section().
+                pass
+            break
+
+        if scIds:
+            self._prefetchJob = self.after_idle(self._prefetch_sections, scIds)
+
+    def _recover_sections(self):
+        # Offer to restore section changes that did not make it
+        # into the project file, e.g. because of a crash.
+        # Then offer to restore the autosaved drafts separately,
+        # because they were never applied.
+        # The journal is only cleared if the project file is up to date,
+        # because it may hold the only copy of unsaved changes.
+        self._restore_sections(
+            self._journal.read(),
+            _('Restore unsaved section changes'),
+        )
+        self._restore_sections(
+            self._journal.read(drafts=True),
+            _('Restore section text that was never applied'),
+        )
+        if self._mdl.isModified:
+            # Drop the rejected changes and the drafts,
+            # but keep the unsaved changes.
+            try:
+                self._journal.compact(self._mdl.novel.sections)
+            except:
+                pass
+        else:
+            self._clear_journal()
+
     def _reconfigure_screen(self):
         resolutionIndex = int(prefs['resolution_index'])
         height, width = RESOLUTIONS[resolutionIndex]
@@ -510,8 +698,10 @@ class WriterView(ModalDialog):
         paddingX = round(int(prefs['padding_x']) * scale)
         fontSize = self._fontSizes[resolutionIndex]
         self._statusBar.set_font(fontSize)
-        self._helpScreen.set_font(fontSize, scale)
-        self._footerBar.set_font(fontSize)
+        if self._helpScreen is not None:
+            self._helpScreen.set_font(fontSize, scale)
+        if self._footerBar is not None:
+            self._footerBar.set_font(fontSize)
         self._editorWindow.configure(
             height=height,
             width=width,
@@ -525,25 +715,109 @@ class WriterView(ModalDialog):
         )
         self._sectionEditor.configure_font((prefs['editor_font'], fontSize,))
 
+    def _poll_wordcount(self):
+        # Display the result of the latest background word count.
+        # Drop the results of older snapshots.
+        self._wcPollJob = None
+        while True:
+            try:
+                generation, future = self._wcResults.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation > self._wcReceived:
+                self._wcReceived = generation
+                if generation == self._wcGeneration:
+                    self._show_wordcount(wc=future.result())
+        if self._wcReceived < self._wcGeneration:
+            self._wcPollJob = self.after(
+                self.WC_POLL_INTERVAL,
+                self._poll_wordcount,
+            )
+
     def _reset_modified_flag(self, event=None):
         self._statusBar.set_modified(False)
         self._sectionEditor.edit_modified(False)
 
+    def _restore_sections(self, journalEntries, question):
+        # Restore the journaled section contents that differ
+        # from the current ones, if the user agrees.
+        recovered = {}
+        for scId, sectionContent in journalEntries.items():
+            if not scId in self._mdl.novel.sections:
+                continue
+
+            if self._mdl.novel.sections[scId].sectionContent != sectionContent:
+                recovered[scId] = sectionContent
+        if not recovered:
+            return
+
+        titles = '\n- '.join(
+            self._mdl.novel.sections[scId].title or _('Untitled')
+            for scId in recovered
+        )
+        if self._ui.ask_yes_no(
+            message=f"{question}?\n\n- {titles}",
+            title=FEATURE,
+            parent=self,
+        ):
+            for scId, sectionContent in recovered.items():
+                self._mdl.novel.sections[scId].sectionContent = sectionContent
+
     def _save_project(self, event=None):
         self._sectionEditor.edit_modified(False)
         self._apply_changes()
         self._ctrl.save_project()
+        if not self._mdl.isModified:
+            self._clear_journal()
         self._statusBar.set_saved()
 
+    def _schedule_autosave(self):
+        autosaveInterval = int(prefs['autosave_interval'])
+        # seconds; 0 means "no autosave"
+        if autosaveInterval > 0:
+            self._autosaveJob = self.after(
+                autosaveInterval * 1000,
+                self._autosave,
+            )
+
+    def _schedule_wordcount(self, event=None):
+        # Count the words when typing pauses.
+        # A burst of keystrokes results in a single count.
+        self._cancel_wordcount()
+        self._wordcountJob = self.after(
+            int(prefs['wordcount_delay']),
+            self._show_scheduled_wordcount,
+        )
+
+    def _set_section_content(self, sectionText):
+        # Apply the validated editor content to the edited section.
+        # Remember it as valid, so it is not validated again when loaded.
+        self._section.sectionContent = sectionText
+        self._verifiedSections[self._scId] = hash(
+            self._section.sectionContent
+        )
+        self._write_journal(self._scId, sectionText)
+
     def _set_wc_mode(self):
         if prefs['live_wordcount']:
-            self.bind('<KeyRelease>', self._show_wordcount)
+            self.bind('<KeyRelease>', self._schedule_wordcount)
             self.unbind('<space>')
         else:
             self.unbind('<KeyRelease>')
             self.bind('<space>', self._freeze_wordcount)
 
     def _show_help_screen(self, event=None):
+        if self._helpScreen is None:
+            resolutionIndex = int(prefs['resolution_index'])
+            height, __ = RESOLUTIONS[resolutionIndex]
+            self._helpScreen = HelpScreen(
+                self._editorWindow,
+            )
+            self._helpScreen.set_font(
+                self._fontSizes[resolutionIndex],
+                height / DEFAULT_HEIGHT,
+            )
         if self._sectionEditor.winfo_manager():
             self._sectionEditor.pack_forget()
         self._helpScreen.pack(fill='x', side='top')
@@ -552,6 +826,10 @@ class WriterView(ModalDialog):
         return 'break'
 
     def _show_footer_bar(self, event=None):
+        if self._footerBar is None:
+            resolutionIndex = int(prefs['resolution_index'])
+            self._footerBar = FooterBar(self._editorWindow)
+            self._footerBar.set_font(self._fontSizes[resolutionIndex])
         if self._sectionEditor.winfo_manager():
             self._sectionEditor.pack_forget()
         self._footerBar.pack(fill='x', side='bottom')
@@ -559,12 +837,29 @@ class WriterView(ModalDialog):
         prefs['show_footer_bar'] = True
         return 'break'
 
+    def _show_scheduled_wordcount(self):
+        # Start a background word count.
+        # The status bar keeps the last value until the result arrives.
+        self._wordcountJob = None
+        self._wcGeneration += 1
+        generation = self._wcGeneration
+        future = self._wcExecutor.submit(
+            self._wordCountCache.update,
+            *self._sectionEditor.get_changed_lines(),
+        )
+        future.add_done_callback(
+            lambda f: self._wcResults.put((generation, f))
+        )
+        if self._wcPollJob is None:
+            self._wcPollJob = self.after(
+                self.WC_POLL_INTERVAL,
+                self._poll_wordcount,
+            )
+
     def _show_wordcount(self, event=None, wc=None):
         # Display the word count on the status bar.
         if wc is None:
-            wc = self.wordCounter.get_word_count(
-                self._sectionEditor.get('1.0', 'end')
-            )
+            wc = self._count_words()
         self._actualWordCount = wc
         diff = wc - self._initialWc
         text = f'{wc} {_("words")} ({diff} {_("new")})'
@@ -594,6 +889,7 @@ class WriterView(ModalDialog):
             status=self._mdl.novel.sections[self._scId].status
         )
         if newId:
+            self._index_editable_sections()
 
             # Cut the actual section's content from the cursor position
             # to the end.
@@ -606,6 +902,7 @@ class WriterView(ModalDialog):
 
             # Copy the section content to the new section.
             self._mdl.novel.sections[newId].sectionContent = newContent
+            self._write_journal(newId, newContent)
 
             # Copy the viewpoint character.
             self._mdl.novel.sections[newId].viewpoint = (
@@ -616,6 +913,67 @@ class WriterView(ModalDialog):
             self._load_next()
             self._askForConfirmation = False
 
+    def _start_session(self):
+        # Set up the project-specific state and load a section.
+        self._section = None
+        self._scId = None
+
+        #--- Configure the editor.
+        self._set_wc_mode()
+        self._askForConfirmation = prefs['ask_for_confirmation']
+        self._index_editable_sections()
+
+        #--- Project-specific configuration
+        fields = self._mdl.novel.fields
+        fields.pop('writer-last-position', None)
+        self._mdl.novel.fields = fields
+        # removing entry from version 0.19.1, if any
+        # TODO: drop this when preparing the final release
+
+        prjDir, __ = os.path.split(self._mdl.prjFile.filePath)
+        self.prjConfigFile = os.path.join(prjDir, PRJ_CONFIG_FILE)
+        self._journal = SectionJournal(
+            os.path.join(prjDir, JOURNAL_FILE),
+            self._mdl.prjFile.filePath,
+        )
+        self._check_journal()
+        prjConfig = ConfigParser()
+        prjConfig.read(self.prjConfigFile)
+        try:
+            recent = prjConfig[RECENT]
+        except:
+            lastScId = lastCursorPos = None
+        else:
+            lastScId = recent.get(RECENT_SECTION, None)
+            lastCursorPos = recent.get(RECENT_POSITION, None)
+            if not self._is_editable(lastScId):
+                lastScId = lastCursorPos = None
+
+        #--- Load the section content into the text editor.
+        scId = self._ui.selectedNode
+        cursorPos = '1.0'
+        if self._is_editable(scId):
+            if scId == lastScId:
+                cursorPos = lastCursorPos
+        elif lastScId is not None:
+            scId = lastScId
+            cursorPos = lastCursorPos
+        else:
+            scId = self._get_first_editable_section()
+            if scId is None:
+                self.on_quit()
+                return
+
+        self._load_section(scId, cursorPos=cursorPos)
+        self._schedule_autosave()
+
+    def _stop_wordcount(self):
+        # Cancel all word count activities before closing the window.
+        self._cancel_wordcount()
+        if self._wcPollJob is not None:
+            self.after_cancel(self._wcPollJob)
+            self._wcPollJob = None
+
     def _strong_emphasis(self, event=None):
         if self._sectionEditor.strong_emphasis():
             self._statusBar.set_modified(True)
@@ -634,14 +992,14 @@ class WriterView(ModalDialog):
         return 'break'
 
     def _toggle_help(self, event=None):
-        if self._helpScreen.winfo_manager():
+        if self._helpScreen is not None and self._helpScreen.winfo_manager():
             self._hide_help_screen()
         else:
             self._show_help_screen()
         return 'break'
 
     def _toggle_display(self, event=None):
-        if self._footerBar.winfo_manager():
+        if self._footerBar is not None and self._footerBar.winfo_manager():
             self._hide_footer_bar()
             self._statusBar.normal()
         else:
@@ -657,3 +1015,12 @@ class WriterView(ModalDialog):
         else:
             self._reset_modified_flag()
 
+    def _write_journal(self, scId, sectionContent, draft=False):
+        # Append the section content to the journal.
+        # Return True on success.
+        try:
+            self._journal.append(scId, sectionContent, draft=draft)
+        except:
+            return False
+
+        return True
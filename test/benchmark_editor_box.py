@@ -0,0 +1,118 @@
+"""Timing benchmarks for the editor box.
+
+Run this script directly; it is not part of the unit test suite.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from timeit import timeit
+
+import tkinter as tk
+
+root = tk.Tk()
+
+from nvwriter.editor_box import EditorBox
+from nvwriter.nvwriter_globals import T_EM
+from nvwriter.nvwriter_globals import prefs
+
+prefs['color_em'] = 'gray85'
+prefs['color_notes'] = 'red'
+prefs['color_strong'] = 'gray85'
+
+PARAGRAPH = (
+    '<p>This is <em>a paragraph</em> with <strong>inline</strong> '
+    'formatting<note id="ftn{0}" class="footnote">'
+    '<note-citation>{0}</note-citation>'
+    '<p>A footnote</p></note>, '
+    '<span xml:lang="en-US">a span</span> and a comment'
+    '<comment><creator>W.C. Hack</creator>'
+    '<date>2024-04-29T07:47:52.35</date>'
+    '<p>Note this.</p></comment>.</p>'
+)
+SECTION_CONTENT = ''.join(PARAGRAPH.format(i) for i in range(2000))
+REPEAT = 5
+
+
+def new_editor():
+    return EditorBox(
+        root,
+        font=('Courier', 12),
+        fg='black',
+        bg='white',
+    )
+
+
+def bench_set_text():
+    editor = new_editor()
+
+    def load_per_chunk():
+        # The former implementation: one Tcl call per (text, tags) tuple.
+        editor.clear()
+        editor._novxParser.feed(SECTION_CONTENT)
+        for text, tags in editor._novxParser.get_result():
+            editor.insert('end', text, tags)
+
+    def load_batched():
+        editor.clear()
+        editor.set_text(SECTION_CONTENT)
+
+    print('EditorBox.set_text')
+    print(f'  per chunk: {timeit(load_per_chunk, number=REPEAT) / REPEAT:.4f} s')
+    print(f'  batched:   {timeit(load_batched, number=REPEAT) / REPEAT:.4f} s')
+
+
+def bench_get_text():
+    editor = new_editor()
+    editor.set_text(SECTION_CONTENT)
+
+    def dump_with_callback():
+        editor.bulkDump = False
+        editor._paragraphCache.clear()
+        editor.get_text()
+
+    def dump_bulk():
+        editor.bulkDump = True
+        editor._paragraphCache.clear()
+        editor.get_text()
+
+    print('EditorBox.get_text')
+    print(f'  callback:  {timeit(dump_with_callback, number=REPEAT) / REPEAT:.4f} s')
+    print(f'  bulk:      {timeit(dump_bulk, number=REPEAT) / REPEAT:.4f} s')
+
+
+def bench_set_format():
+    editor = new_editor()
+
+    def will_modify_per_character(newTag):
+        # The former selection check: Tcl calls for each character.
+        index = 'sel.first'
+        while editor.compare(index, '<=', 'sel.last'):
+            if not newTag in editor.tag_names(index):
+                return True
+
+            index = editor.index(f'{index}+1c')
+            if editor.compare(index, '>=', 'end-1c'):
+                break
+        return False
+
+    def will_modify_per_range(newTag):
+        return not editor._is_tagged(newTag, 'sel.first', 'sel.last')
+
+    print('EditorBox._set_format selection check')
+    for length in (1000, 10000, 100000):
+        editor.clear()
+        editor.insert('end', 'x' * length, T_EM)
+        editor.tag_add('sel', '1.0', 'end-1c')
+        # The entire selection is emphasized, so each character is checked.
+        perCharacter = timeit(lambda: will_modify_per_character(T_EM), number=1)
+        perRange = timeit(lambda: will_modify_per_range(T_EM), number=1)
+        print(f'  {length:>6} characters:')
+        print(f'    per character: {perCharacter:.4f} s')
+        print(f'    per range:     {perRange:.6f} s')
+
+
+if __name__ == '__main__':
+    bench_set_text()
+    bench_get_text()
+    bench_set_format()
@@ -0,0 +1,100 @@
+"""Benchmarks for the novx parser.
+
+Run this script directly; it is not part of the unit test suite.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from timeit import timeit
+import tracemalloc
+
+import tkinter as tk
+
+root = tk.Tk()
+
+from nvwriter.novx_parser import NovxParser
+
+PARAGRAPH = (
+    '<p>This is a <em>paragraph with <strong>nested</strong> '
+    'emphasis</em> and <span xml:lang="en-US">a span</span>, '
+    'followed by <em>some more</em> regular text.</p>'
+)
+# 20 words
+PLAIN_PARAGRAPH = (
+    '<p>This is a <em>paragraph with <strong>nested</strong> '
+    'emphasis</em> and some more <em>emphasized</em> regular text.</p>'
+)
+# 15 words, no span
+SECTION_CONTENT = PARAGRAPH * 5000
+# 100,000 words
+REPEAT = 5
+
+
+def bench_feed():
+    novxParser = NovxParser()
+    novxParser.feed(PARAGRAPH)
+    # warm up
+
+    tracemalloc.start()
+    novxParser.feed(SECTION_CONTENT)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    taggedText = novxParser.get_result()
+    allocations = sum(stat.count for stat in snapshot.statistics('filename'))
+    tagObjects = len({id(tags) for __, tags in taggedText})
+    print('NovxParser.feed, 100,000 words')
+    print(f'  text chunks:         {len(taggedText)}')
+    print(f'  distinct tag objects: {tagObjects}')
+    print(f'  live allocations:    {allocations}')
+    print(f'  memory after feed:   {current / 1024:.0f} KiB')
+    print(f'  peak memory:         {peak / 1024:.0f} KiB')
+
+
+def bench_backends():
+    novxParser = NovxParser()
+
+    def feed_sax():
+        novxParser.useExpat = False
+        novxParser.feed(SECTION_CONTENT)
+
+    def feed_expat():
+        novxParser.useExpat = True
+        novxParser.feed(SECTION_CONTENT)
+
+    print('NovxParser.feed backends, 100,000 words')
+    print(f'  xml.sax: {timeit(feed_sax, number=REPEAT) / REPEAT:.4f} s')
+    print(f'  expat:   {timeit(feed_expat, number=REPEAT) / REPEAT:.4f} s')
+
+
+def bench_fast_path():
+    novxParser = NovxParser()
+    plainContent = PLAIN_PARAGRAPH * 6000
+    # 90,000 words
+
+    def feed_sax():
+        novxParser.useFastPath = False
+        novxParser.useExpat = False
+        novxParser.feed(plainContent)
+
+    def feed_expat():
+        novxParser.useFastPath = False
+        novxParser.useExpat = True
+        novxParser.feed(plainContent)
+
+    def feed_fast_path():
+        novxParser.useFastPath = True
+        novxParser.feed(plainContent)
+
+    print('NovxParser.feed plain paragraphs, 90,000 words')
+    print(f'  xml.sax:   {timeit(feed_sax, number=REPEAT) / REPEAT:.4f} s')
+    print(f'  expat:     {timeit(feed_expat, number=REPEAT) / REPEAT:.4f} s')
+    print(f'  fast path: {timeit(feed_fast_path, number=REPEAT) / REPEAT:.4f} s')
+
+
+if __name__ == '__main__':
+    bench_feed()
+    bench_backends()
+    bench_fast_path()
@@ -0,0 +1,197 @@
+"""Unit test for the navigation index of the editable sections.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import unittest
+
+import tkinter as tk
+
+root = tk.Tk()
+
+from nvlib.novx_globals import CH_ROOT
+from nvwriter.writer_view import WriterView
+
+
+class Section:
+
+    def __init__(self, scType):
+        self.scType = scType
+
+
+class Tree:
+    # The part of the novel tree's interface used for navigation.
+
+    def __init__(self):
+        self._children = {CH_ROOT: []}
+        self._parents = {}
+
+    def get_children(self, item):
+        return tuple(self._children.get(item, ()))
+
+    def insert(self, parent, index, iid):
+        self._children[parent].insert(index, iid)
+        self._children.setdefault(iid, [])
+        self._parents[iid] = parent
+
+    def parent(self, item):
+        return self._parents[item]
+
+
+class Novel:
+
+    def __init__(self):
+        self.tree = Tree()
+        self.sections = {}
+
+
+class Model:
+
+    def __init__(self):
+        self.novel = Novel()
+
+
+class SectionIndex:
+    # The navigation methods of the writer view, without the window.
+
+    _get_first_editable_section = WriterView._get_first_editable_section
+    _get_next_editable_section = WriterView._get_next_editable_section
+    _get_prev_editable_section = WriterView._get_prev_editable_section
+    _index_editable_sections = WriterView._index_editable_sections
+    _is_editable = WriterView._is_editable
+
+    def __init__(self, model):
+        self._mdl = model
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.model = Model()
+        self.sectionIndex = SectionIndex(self.model)
+        self.newId = 0
+        chapters = (
+            (0, 1, 0),
+            (),
+            (2, 0),
+            (1,),
+            (0,),
+        )
+        # section types per chapter
+        for chapterIndex, scTypes in enumerate(chapters):
+            chId = f'ch{chapterIndex + 1}'
+            self.model.novel.tree.insert(CH_ROOT, len(chapters), chId)
+            for scType in scTypes:
+                self.add_section(chId, 'end', scType)
+        self.sectionIndex._index_editable_sections()
+
+    def tearDown(self):
+        pass
+
+    def add_section(self, chId, index, scType):
+        # Add a section to the chapter, and return its ID.
+        self.newId += 1
+        scId = f'sc{self.newId}'
+        if index == 'end':
+            index = len(self.model.novel.tree.get_children(chId))
+        self.model.novel.tree.insert(chId, index, scId)
+        self.model.novel.sections[scId] = Section(scType)
+        return scId
+
+    def add_section_after(self, targetNode, scType):
+        # Add a section after targetNode, as the controller does
+        # when creating, splitting, or cloning a section.
+        tree = self.model.novel.tree
+        chId = tree.parent(targetNode)
+        index = tree.get_children(chId).index(targetNode) + 1
+        scId = self.add_section(chId, index, scType)
+        self.sectionIndex._index_editable_sections()
+        return scId
+
+    def assert_same_navigation(self):
+        # Compare the index-based navigation with the tree walk.
+        sectionsInOrder = [
+            scId
+            for chId in self.model.novel.tree.get_children(CH_ROOT)
+            for scId in self.model.novel.tree.get_children(chId)
+        ]
+        editableSections = [
+            scId for scId in sectionsInOrder
+            if self.sectionIndex._is_editable(scId)
+        ]
+        self.assertEqual(
+            self.sectionIndex._get_first_editable_section(),
+            editableSections[0],
+        )
+        for scId in editableSections:
+            self.assertEqual(
+                self.sectionIndex._get_next_editable_section(scId),
+                self.walk(sectionsInOrder, scId, 1),
+                scId,
+            )
+            self.assertEqual(
+                self.sectionIndex._get_prev_editable_section(scId),
+                self.walk(sectionsInOrder, scId, -1),
+                scId,
+            )
+
+    def walk(self, sectionsInOrder, scId, step):
+        # Return the neighbouring editable section, walking the tree
+        # one node at a time like the tree viewer's next_node()
+        # and prev_node() methods.
+        i = sectionsInOrder.index(scId) + step
+        while 0 <= i < len(sectionsInOrder):
+            if self.sectionIndex._is_editable(sectionsInOrder[i]):
+                return sectionsInOrder[i]
+
+            i += step
+        return None
+
+    def test_chapter_boundaries(self):
+        self.assert_same_navigation()
+        self.assertEqual(
+            self.sectionIndex._get_next_editable_section('sc3'),
+            'sc5',
+        )
+        self.assertEqual(
+            self.sectionIndex._get_prev_editable_section('sc7'),
+            'sc5',
+        )
+        self.assertIsNone(self.sectionIndex._get_prev_editable_section('sc1'))
+        self.assertIsNone(self.sectionIndex._get_next_editable_section('sc7'))
+
+    def test_clone_section(self):
+        # The clone is "unused", so it is skipped.
+        self.add_section_after('sc1', 1)
+        self.assert_same_navigation()
+        self.assertEqual(
+            self.sectionIndex._get_next_editable_section('sc1'),
+            'sc3',
+        )
+
+    def test_create_section(self):
+        newId = self.add_section_after('sc3', 0)
+        self.assert_same_navigation()
+        self.assertEqual(
+            self.sectionIndex._get_next_editable_section('sc3'),
+            newId,
+        )
+        newId = self.add_section_after('sc7', 0)
+        self.assert_same_navigation()
+        self.assertEqual(
+            self.sectionIndex._get_prev_editable_section(newId),
+            'sc7',
+        )
+
+    def test_split_section(self):
+        newId = self.add_section_after('sc5', 0)
+        self.assert_same_navigation()
+        self.assertEqual(
+            self.sectionIndex._get_next_editable_section(newId),
+            'sc7',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Unit test for the editor font size calculation.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import unittest
+
+import tkinter as tk
+
+root = tk.Tk()
+
+from nvwriter.nvwriter_globals import DEFAULT_HEIGHT
+from nvwriter.nvwriter_globals import MAX_CH_PER_LINE
+from nvwriter.nvwriter_globals import MIN_FONT_SIZE
+from nvwriter.nvwriter_globals import RESOLUTIONS
+from nvwriter.nvwriter_globals import SCROLLBAR_WIDTH
+from nvwriter.nvwriter_globals import prefs
+from nvwriter.writer_service import WriterService
+
+
+class FakeWriterService(WriterService):
+    # A writer service with fake font metrics.
+
+    def __init__(self, pixelsPerPoint):
+        self.pixelsPerPoint = pixelsPerPoint
+        self.measurements = 0
+
+    def _get_line_length(self, fontSize):
+        self.measurements += 1
+        digitWidth = round(fontSize * self.pixelsPerPoint * 0.6)
+        return digitWidth * MAX_CH_PER_LINE
+
+
+def calculate_font_sizes_linearly(service):
+    # Return the font sizes as calculated before the binary search.
+    fontSizes = []
+    fontSize = MIN_FONT_SIZE
+    for height, width in RESOLUTIONS:
+        scale = height / DEFAULT_HEIGHT
+        paddingX = round(int(prefs['padding_x']) * scale)
+        textAreaWidth = width - (2 * paddingX) - SCROLLBAR_WIDTH
+        while service._get_line_length(fontSize) < textAreaWidth:
+            fontSize += 1
+        fontSizes.append(fontSize - 1)
+    return fontSizes
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.prefs = dict(prefs)
+        prefs.update(
+            editor_font='Courier',
+            font_sizes='',
+            font_sizes_key='',
+            padding_x=10,
+        )
+
+    def tearDown(self):
+        prefs.clear()
+        prefs.update(self.prefs)
+
+    def test_binary_search(self):
+        for paddingX in (0, 10, 50, 150):
+            prefs['padding_x'] = paddingX
+            for pixelsPerPoint in (0.2, 0.75, 1, 1.33, 1.5, 2, 3):
+                service = FakeWriterService(pixelsPerPoint)
+                self.assertEqual(
+                    service._calculate_font_sizes(),
+                    calculate_font_sizes_linearly(service),
+                    (paddingX, pixelsPerPoint),
+                )
+
+    def test_cache(self):
+        service = FakeWriterService(1)
+        fontSizes = service.get_font_sizes()
+        self.assertEqual(
+            prefs['font_sizes'],
+            ','.join(str(s) for s in fontSizes),
+        )
+
+        # Use the font sizes from the configuration.
+        service = FakeWriterService(1)
+        self.assertEqual(service.get_font_sizes(), fontSizes)
+        self.assertEqual(service.measurements, 1)
+
+        # Calculate anew with another font.
+        prefs['editor_font'] = 'Arial'
+        service = FakeWriterService(1)
+        self.assertEqual(service.get_font_sizes(), fontSizes)
+        self.assertGreater(service.measurements, 1)
+
+        # Calculate anew with another horizontal padding.
+        prefs['padding_x'] = 50
+        service = FakeWriterService(1)
+        self.assertEqual(
+            service.get_font_sizes(),
+            calculate_font_sizes_linearly(service),
+        )
+        self.assertNotEqual(service.get_font_sizes(), fontSizes)
+
+        # Calculate anew on a screen with other font metrics.
+        prefs['padding_x'] = 10
+        service = FakeWriterService(1)
+        service.get_font_sizes()
+        service = FakeWriterService(2)
+        self.assertEqual(
+            service.get_font_sizes(),
+            calculate_font_sizes_linearly(service),
+        )
+        self.assertNotEqual(service.get_font_sizes(), fontSizes)
+
+    def test_invalid_cache(self):
+        service = FakeWriterService(1)
+        fontSizes = service.get_font_sizes()
+        prefs['font_sizes'] = '1,2'
+        service = FakeWriterService(1)
+        self.assertEqual(service.get_font_sizes(), fontSizes)
+        self.assertGreater(service.measurements, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
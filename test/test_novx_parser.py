@@ -0,0 +1,154 @@
+"""Differential test for the novx parser's fast path.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import random
+import unittest
+
+import tkinter as tk
+
+root = tk.Tk()
+
+from nvwriter.editor_box import EditorBox
+from nvwriter.novx_parser import NovxParser
+
+PLAIN_SECTION = (
+    '<p>This is <em>emphasized</em> and <strong>strongly '
+    '<em>emphasized</em></strong> text.</p>\n'
+    '<p>Entities: &lt;&amp;&gt; &quot;quoted&quot; &apos;quoted&apos;</p>'
+    '<p></p>'
+)
+NON_PLAIN_SECTIONS = [
+    '<p style="quotations">Quoted</p>',
+    '<h5>Heading</h5><p>Text</p>',
+    '<ul><li><p>One</p></li><li><p>Two</p></li></ul>',
+    '<p>A <span xml:lang="en-US">span</span></p>',
+    (
+        '<p>Text<comment><creator>W.C. Hack</creator>'
+        '<date>2024-04-29T07:47:52.35</date><p>Note this.</p></comment></p>'
+    ),
+    (
+        '<p>Text<note id="ftn0" class="footnote">'
+        '<note-citation>1</note-citation><p>Footnote</p></note></p>'
+    ),
+    '<p>Character reference: &#38;</p>',
+    '<p>Line\r\nbreak</p>',
+    '<p><![CDATA[<em>]]></p>',
+    '<p>Comment<!-- a > b --></p>',
+    '<p>Unclosed',
+    '<p><em>Overlapping</p></em>',
+    '<p>Unescaped < character</p>',
+    '<p>Unknown &nbsp; entity</p>',
+    '<p><em/>Empty element</p>',
+]
+NESTED_SECTIONS = [
+    '<p><em><span xml:lang="en-US">Emphasized span</span></em></p>',
+    '<p><span xml:lang="en-US"><em>Emphasized span</em></span></p>',
+    '<p><strong><em>Strongly emphasized</em></strong></p>',
+    '<p><em><strong>Strongly emphasized</strong></em></p>',
+    '<p><em>One <strong>two <span xml:lang="de-DE">drei</span></strong></em></p>',
+]
+TEXTS = ['Text', ' ', 'more text', '&amp;', '&lt;em&gt;', 'a > b', '\n', 'Äü']
+
+
+def random_inline(rnd, depth=0):
+    parts = []
+    for __ in range(rnd.randint(0, 4)):
+        choice = rnd.random()
+        if choice < 0.6 or depth > 2:
+            parts.append(rnd.choice(TEXTS))
+        elif choice < 0.8:
+            parts.append(f'<em>{random_inline(rnd, depth + 1)}</em>')
+        else:
+            parts.append(f'<strong>{random_inline(rnd, depth + 1)}</strong>')
+    return ''.join(parts)
+
+
+def random_section(rnd):
+    paragraphs = [
+        f'<p>{random_inline(rnd)}</p>' for __ in range(rnd.randint(1, 5))
+    ]
+    if rnd.random() < 0.3:
+        paragraphs.insert(
+            rnd.randrange(len(paragraphs)),
+            rnd.choice(NON_PLAIN_SECTIONS),
+        )
+    return rnd.choice(['', '\n']).join(paragraphs)
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.fastParser = NovxParser()
+        self.saxParser = NovxParser()
+        self.saxParser.useFastPath = False
+        self.saxParser.useExpat = False
+
+    def tearDown(self):
+        pass
+
+    def test_innermost_tag_first(self):
+        for novxParser in (self.fastParser, self.saxParser):
+            novxParser.feed('<p><strong><em>Text</em></strong></p>')
+            self.assertEqual(
+                novxParser.get_result(),
+                [('Text', ('em', 'strong'))],
+            )
+
+    def parse(self, novxParser, xmlString):
+        # Return the result character by character,
+        # because the text chunks may be split differently.
+        try:
+            novxParser.feed(xmlString)
+        except:
+            return None
+
+        characters = []
+        for text, tags in novxParser.get_result():
+            if isinstance(tags, str):
+                tags = (tags,) if tags else ()
+            characters.extend((c, tuple(tags)) for c in text)
+        return (
+            characters,
+            [(c.creator, c.date, c.text) for c in novxParser.comments],
+            [
+                (n.noteId, n.noteClass, n.noteCitation, n.text)
+                for n in novxParser.notes
+            ],
+        )
+
+    def test_fast_path_taken(self):
+        self.assertTrue(self.fastParser._feed_plain_content(PLAIN_SECTION))
+        for xmlString in NON_PLAIN_SECTIONS:
+            self.fastParser.feed('')
+            self.assertFalse(self.fastParser._feed_plain_content(xmlString))
+
+    def test_round_trip(self):
+        # The editor box must rebuild the nesting of the formatting tags.
+        editor = EditorBox(root)
+        for novxParser in (self.fastParser, self.saxParser):
+            for xmlString in NESTED_SECTIONS:
+                novxParser.feed(xmlString)
+                editor.set_parsed_text(
+                    novxParser.get_result(),
+                    novxParser.comments,
+                    novxParser.notes,
+                )
+                self.assertEqual(editor.get_text(), xmlString)
+
+    def test_same_result(self):
+        rnd = random.Random(0)
+        corpus = [PLAIN_SECTION] + NON_PLAIN_SECTIONS
+        corpus.extend(random_section(rnd) for __ in range(2000))
+        for xmlString in corpus:
+            self.assertEqual(
+                self.parse(self.fastParser, xmlString),
+                self.parse(self.saxParser, xmlString),
+                xmlString,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
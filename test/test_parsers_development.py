@@ -37,6 +37,13 @@ class Test(unittest.TestCase):
         except RuntimeError:
             self.fail('Validation failed')
 
+    def test_novx_validity_while_parsing(self):
+        self.editor.set_text(SECTION_CONTENT)
+        try:
+            self.editor.get_text(validate=True)
+        except RuntimeError:
+            self.fail('Validation failed')
+
     def test_section_content(self):
         self.editor.debug = True
         self.editor.set_text(SECTION_CONTENT)
@@ -4,6 +4,7 @@ Copyright (c) Peter Triesberger
 For further information see https://github.com/peter88213/nv_writer
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+import re
 import unittest
 
 import tkinter as tk
@@ -11,8 +12,19 @@ import tkinter as tk
 root = tk.Tk()
 
 from nvwriter.editor_box import EditorBox
+from nvwriter.novx_parser import NovxParser
 from nvwriter.nvwriter_globals import prefs
+from nvwriter.parsed_section_cache import ParsedSectionCache
+from nvwriter.text_parser import TextParser
+from nvwriter.word_count_cache import WordCountCache
 
+ADJACENT_COMMENTS = (
+    '<p>One<comment><creator>A</creator><date>2024-04-29T07:47:52</date>'
+    '<p>two</p></comment><comment><creator>B</creator>'
+    '<date>2024-04-29T07:47:53</date><p>three</p></comment> four'
+    '<comment><creator>C</creator><date>2024-04-29T07:47:54</date>'
+    '<p>five</p></comment></p>'
+)
 FOOTNOTE = (
     '<p>This is a regular line'
     '<note id="ftn0" class="footnote">'
@@ -20,6 +32,14 @@ FOOTNOTE = (
     '<p>This is a footnote</p></note>'
     ' of the test section</p>'
 )
+FOOTNOTE_AND_COMMENT_WITH_ENTITIES = (
+    '<p>Text<note id="ftn0" class="footnote">'
+    '<note-citation>1</note-citation>'
+    '<p>A &amp; B</p></note> and a comment'
+    '<comment><creator>Smith &amp; Sons</creator>'
+    '<date>2024-04-29T07:47:52.35</date>'
+    '<p>C &lt; D</p></comment>.</p>'
+)
 FOOTNOTE_EM = (
     '<p><em>Text<note id="ftn1" class="footnote">'
     '<note-citation>1</note-citation>'
@@ -268,10 +288,68 @@ class Test(unittest.TestCase):
     def tearDown(self):
         pass
 
+    def test_comment_selection(self):
+        lastComment = (
+            '<comment><creator>C</creator><date>2024-04-29T07:47:54</date>'
+            '<p>five</p></comment>'
+        )
+
+        # Uncomment the adjacent comments within the selection.
+        self.editor.set_text(ADJACENT_COMMENTS)
+        self.editor.tag_add('sel', '1.3', '1.11')
+        self.assertFalse(self.editor.comment())
+        self.assertEqual(
+            self.editor.get_text(),
+            f'<p>Onetwothree four{lastComment}</p>'
+        )
+
+        # Make the selection a new comment.
+        self.editor.set_author_name('D')
+        self.assertTrue(self.editor.comment())
+        self.assertRegex(
+            self.editor.get_text(),
+            (
+                f"^{re.escape('<p>One<comment><creator>D</creator><date>')}"
+                '[0-9T:-]+'
+                f"{re.escape(f'</date><p>twothree</p></comment> four{lastComment}</p>')}$"
+            )
+        )
+
+        # Uncomment only the selected part of a comment.
+        self.editor.set_text(ADJACENT_COMMENTS)
+        self.editor.tag_add('sel', '1.4', '1.11')
+        self.assertFalse(self.editor.comment())
+        self.assertEqual(
+            self.editor.get_text(),
+            (
+                '<p>One<comment><creator>A</creator>'
+                '<date>2024-04-29T07:47:52</date><p>t</p></comment>'
+                f'wothree four{lastComment}</p>'
+            )
+        )
+
+    def test_edited_paragraph(self):
+        self.editor.set_text(OK_WITH_0_10_0)
+        self.editor.get_text()
+        self.editor.insert('1.0', 'New: ')
+        self.assertEqual(
+            self.editor.get_text(),
+            OK_WITH_0_10_0.replace('<p>This', '<p>New: This', 1)
+        )
+        self.editor.delete('1.0', '1.0+5c')
+        self.assertEqual(self.editor.get_text(), OK_WITH_0_10_0)
+
     def test_footnote(self):
         self.editor.set_text(FOOTNOTE)
         self.assertEqual(self.editor.get_text(), FOOTNOTE)
 
+    def test_footnote_and_comment_with_entities(self):
+        self.editor.set_text(FOOTNOTE_AND_COMMENT_WITH_ENTITIES)
+        self.assertEqual(
+            self.editor.get_text(validate=True, strict=True),
+            FOOTNOTE_AND_COMMENT_WITH_ENTITIES,
+        )
+
     def test_footnote_em(self):
         self.editor.set_text(FOOTNOTE_EM)
         self.assertEqual(self.editor.get_text(), FOOTNOTE_EM)
@@ -320,6 +398,65 @@ class Test(unittest.TestCase):
         self.editor.set_text(NESTED_FORMATS)
         self.assertEqual(self.editor.get_text(), NESTED_FORMATS)
 
+    def test_not_well_formed(self):
+        textParser = TextParser()
+        textParser.reset(validate=True)
+        textParser.append_xml('<p>A & B</p>')
+        self.assertEqual(textParser.get_result(), '<p>A & B</p>')
+        textParser.reset(validate=True, strict=True)
+        textParser.append_xml('<p>A & B</p>')
+        with self.assertRaises(RuntimeError):
+            textParser.get_result()
+
+    def test_parsed_section_cache(self):
+        novxParser = NovxParser()
+        novxParser.feed(TAGGED_PARAGRAPH_WITH_COMMENT)
+        cache = ParsedSectionCache(1)
+        cache.put(
+            'sc1',
+            hash(TAGGED_PARAGRAPH_WITH_COMMENT),
+            novxParser.get_result(),
+            novxParser.comments,
+            novxParser.notes,
+        )
+        novxParser.feed(FOOTNOTE)
+        self.assertIsNone(cache.get('sc1', hash(FOOTNOTE)))
+
+        # Editing the comment in the editor must not affect the cache.
+        self.editor.set_parsed_text(
+            *cache.get('sc1', hash(TAGGED_PARAGRAPH_WITH_COMMENT))
+        )
+        self.editor._novxParser.comments[0].text = 'Changed'
+        self.editor.set_parsed_text(
+            *cache.get('sc1', hash(TAGGED_PARAGRAPH_WITH_COMMENT))
+        )
+        self.assertEqual(self.editor.get_text(), TAGGED_PARAGRAPH_WITH_COMMENT)
+
+        cache.put('sc2', hash(FOOTNOTE), [], [], [])
+        self.assertFalse(('sc1', hash(TAGGED_PARAGRAPH_WITH_COMMENT)) in cache)
+
+    def test_redundant_tags(self):
+        textParser = TextParser()
+        textParser.reset()
+        textParser.parse_dump([
+            'text', 'Text ', '1.0',
+            'tagon', 'em', '1.5',
+            'text', 'emphasized', '1.5',
+            'tagoff', 'em', '1.15',
+            'tagon', 'em', '1.15',
+            'text', ' twice', '1.15',
+            'tagoff', 'em', '1.21',
+            'tagon', 'span_xml:lang="en-US"', '1.21',
+            'tagon', 'span_xml:lang="de-DE"', '1.21',
+            'tagoff', 'span_xml:lang="de-DE"', '1.21',
+            'tagoff', 'span_xml:lang="en-US"', '1.21',
+            'text', '\n', '1.21',
+        ])
+        self.assertEqual(
+            textParser.get_result(),
+            '<p>Text <em>emphasized twice</em></p>',
+        )
+
     def test_regressions(self):
         self.editor.set_text(OK_WITH_0_10_0)
         self.assertEqual(self.editor.get_text(), OK_WITH_0_10_0)
@@ -396,6 +533,15 @@ class Test(unittest.TestCase):
         self.editor.set_text(TAGGED_PARAGRAPH_WITH_COMMENT)
         self.assertEqual(self.editor.get_text(), TAGGED_PARAGRAPH_WITH_COMMENT)
 
+    def test_to_uppercase(self):
+        self.editor.set_text(NESTED_FORMATS)
+        self.editor.tag_add('sel', '1.0', 'end-1c')
+        self.editor.to_uppercase()
+        self.assertEqual(
+            self.editor.get_text(),
+            '<p>THIS IS <strong><em>DOUBLE-FORMATTED</em></strong> TEXT</p>'
+        )
+
     def test_untagged_and_tagged_paragraphs(self):
         self.editor.set_text(UNTAGGED_AND_TAGGED_PARAGRAPHS)
         self.assertEqual(self.editor.get_text(), UNTAGGED_AND_TAGGED_PARAGRAPHS)
@@ -440,6 +586,24 @@ class Test(unittest.TestCase):
         self.editor.set_text(UNTAGGED_PARAGRAPH_WITH_COMMENT)
         self.assertEqual(self.editor.get_text(), UNTAGGED_PARAGRAPH_WITH_COMMENT)
 
+    def test_word_count(self):
+
+        class WordCounter:
+
+            def get_word_count(self, text):
+                return len(text.split())
+
+        wordCounter = WordCounter()
+        wordCountCache = WordCountCache(wordCounter)
+        self.editor.set_text(OK_WITH_0_10_0)
+        wordCountCache.update(*self.editor.get_changed_lines())
+        self.editor.insert('2.0', 'two new words\n')
+        self.editor.delete('5.0', '6.0')
+        self.assertEqual(
+            wordCountCache.update(*self.editor.get_changed_lines()),
+            wordCounter.get_word_count(self.editor.get('1.0', 'end')),
+        )
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -0,0 +1,98 @@
+"""Unit test for the section journal.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import tempfile
+import unittest
+
+from nvwriter.section_journal import SectionJournal
+
+
+class Section:
+
+    def __init__(self, sectionContent):
+        self.sectionContent = sectionContent
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.tempDir.name, 'nv_writer.journal')
+        self.projectPath = os.path.join(self.tempDir.name, 'novel.novx')
+        with open(self.projectPath, 'w', encoding='utf-8') as f:
+            f.write('<novx/>')
+        self.journal = SectionJournal(self.filePath, self.projectPath)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_compact(self):
+        self.journal.append('sc1', '<p>One</p>')
+        self.journal.append('sc2', '<p>Two</p>')
+        self.journal.append('sc1', '<p>One\nmore</p>')
+        self.journal.compact({'sc1': Section('<p>Applied</p>')})
+        self.assertEqual(self.journal.read(), {'sc1': '<p>Applied</p>'})
+        self.journal.compact({})
+        self.assertFalse(os.path.isfile(self.filePath))
+
+    def test_drafts(self):
+        self.journal.append('sc1', '<p>One</p>')
+        self.journal.append('sc1', '<p>One draft</p>', draft=True)
+        self.journal.append('sc2', '<p>Two draft</p>', draft=True)
+        self.journal.append('sc2', '<p>Two</p>')
+        self.journal.append('sc3', '<p>Three draft</p>', draft=True)
+        self.assertEqual(
+            self.journal.read(),
+            {'sc1': '<p>One</p>', 'sc2': '<p>Two</p>'},
+        )
+        self.assertEqual(
+            self.journal.read(drafts=True),
+            {'sc1': '<p>One draft</p>', 'sc3': '<p>Three draft</p>'},
+        )
+        self.journal.compact({
+            'sc1': Section('<p>One</p>'),
+            'sc2': Section('<p>Two</p>'),
+            'sc3': Section('<p>Three</p>'),
+        })
+        self.assertEqual(self.journal.read(drafts=True), {})
+
+    def test_other_project(self):
+        self.journal.append('sc1', '<p>One</p>')
+        otherJournal = SectionJournal(
+            self.filePath,
+            os.path.join(self.tempDir.name, 'other.novx'),
+        )
+        self.assertEqual(otherJournal.read(), {})
+
+    def test_project_saved(self):
+        self.journal.append('sc1', '<p>One</p>')
+        with open(self.projectPath, 'w', encoding='utf-8') as f:
+            f.write('<novx>saved</novx>')
+        self.assertEqual(self.journal.read(), {})
+        self.journal.append('sc2', '<p>Two</p>')
+        self.assertEqual(self.journal.read(), {'sc2': '<p>Two</p>'})
+
+    def test_read(self):
+        self.assertEqual(self.journal.read(), {})
+        self.journal.append('sc1', '<p>One</p>')
+        self.journal.append('sc2', '<p>Two\r\n</p>')
+        self.journal.append('sc1', '<p>Ünïcode</p>')
+        self.assertEqual(
+            self.journal.read(),
+            {'sc1': '<p>Ünïcode</p>', 'sc2': '<p>Two\r\n</p>'},
+        )
+
+    def test_truncated_record(self):
+        self.journal.append('sc1', '<p>One</p>')
+        self.journal.append('sc2', '<p>Two</p>')
+        with open(self.filePath, 'r+', encoding='utf-8') as f:
+            f.truncate(os.path.getsize(self.filePath) - 3)
+        self.assertEqual(self.journal.read(), {'sc1': '<p>One</p>'})
+
+
+if __name__ == "__main__":
+    unittest.main()
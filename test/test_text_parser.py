@@ -0,0 +1,54 @@
+"""Differential test for the text parser's XML sanitizing.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import random
+import unittest
+from xml.sax.saxutils import escape
+
+import tkinter as tk
+
+root = tk.Tk()
+
+from nvlib.model.xml.xml_filter import strip_illegal_characters
+from nvwriter.text_parser import TextParser
+
+CHARACTERS = (
+    [chr(i) for i in range(0x20)]
+    + list('&<>|;"\' aZ')
+    + ['&amp;', 'Äö', '„', '—', '�', '\U0001f600']
+)
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.textParser = TextParser()
+
+    def tearDown(self):
+        pass
+
+    def sanitize(self, text):
+        # Return the paragraph content generated by the text parser.
+        self.textParser.reset()
+        self.textParser.characters(text)
+        return self.textParser.get_result()[len('<p>'):-len('</p>')]
+
+    def test_same_result(self):
+        rnd = random.Random(0)
+        for __ in range(20000):
+            text = 'x' + ''.join(
+                rnd.choice(CHARACTERS) for __ in range(rnd.randint(0, 30))
+            ).replace('\n', '')
+            # not starting a list item, not ending the paragraph
+            self.assertEqual(
+                self.sanitize(text),
+                strip_illegal_characters(escape(text)),
+                repr(text),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Unit test for the reuse of the writer window.
+
+Copyright (c) Peter Triesberger
+For further information see https://github.com/peter88213/nv_writer
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import unittest
+
+import tkinter as tk
+
+root = tk.Tk()
+
+from nvwriter.nvwriter_globals import prefs
+from nvwriter.writer_view import WriterView
+
+
+class Novel:
+    pass
+
+
+class Model:
+
+    def __init__(self):
+        self.novel = Novel()
+
+
+class Window:
+    # The reuse logic of the writer view, without the window.
+
+    is_reusable = WriterView.is_reusable
+    _check_journal = WriterView._check_journal
+
+    def __init__(self, model):
+        self._mdl = model
+        self._recoveredNovel = None
+        self._standbyPrefs = None
+        self._verifiedSections = {}
+        self.journalChecks = 0
+        self._check_journal()
+
+    def reopen(self):
+        # Start a new session in the same project.
+        self._check_journal()
+
+    def withdraw(self):
+        self._standbyPrefs = dict(prefs)
+
+    def winfo_exists(self):
+        return 1
+
+    def _recover_sections(self):
+        self.journalChecks += 1
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.prefs = dict(prefs)
+        self.model = Model()
+
+    def tearDown(self):
+        prefs.clear()
+        prefs.update(self.prefs)
+
+    def test_changed_preferences(self):
+        window = Window(self.model)
+        window.withdraw()
+        prefs['resolution_index'] = 99
+        self.assertFalse(window.is_reusable())
+
+    def test_project_switch(self):
+        window = Window(self.model)
+        window.withdraw()
+        self.assertTrue(window.is_reusable())
+        window.reopen()
+        window.withdraw()
+        self.assertEqual(window.journalChecks, 1)
+
+        # Open another project.
+        self.model.novel = Novel()
+        self.assertFalse(window.is_reusable())
+        window = Window(self.model)
+        window.withdraw()
+        self.assertTrue(window.is_reusable())
+        window.reopen()
+        self.assertEqual(window.journalChecks, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()